@@ -4,13 +4,43 @@ Generate architecture diagram for PyClaudeCli project.
 This script analyzes the codebase and creates an architecture diagram at Resources/Arch.png.
 """
 
+import argparse
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import ast
-import json
-from typing import Dict, List, Set, Tuple
+import shutil
+from typing import Dict, Iterator, List, Set, Tuple
+
+# Directories that are never descended into while looking for sources
+EXCLUDED_DIRS = frozenset({'Tests', '__pycache__', '.git', '.venv'})
+
+def analyze_source(content: str, filename: str) -> Tuple[Set[str], List[str], List[str]]:
+    """Return the imports, classes and top-level functions of a Python source."""
+    tree = ast.parse(content, filename=filename)
+    
+    # Top-level functions are the direct children of the module
+    functions = [
+        node.name for node in ast.iter_child_nodes(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    
+    # Extract imports and classes in a single walk
+    imports = set()
+    classes = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                imports.add(node.module)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+    
+    return imports, classes, functions
 
 class CodeAnalyzer:
     """Analyze Python codebase structure and dependencies."""
@@ -20,38 +50,18 @@ class CodeAnalyzer:
         self.imports: Dict[str, Set[str]] = {}
         self.classes: Dict[str, List[str]] = {}
         self.functions: Dict[str, List[str]] = {}
-        
+    
     def analyze_file(self, file_path: Path) -> None:
         """Analyze a single Python file."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            tree = ast.parse(content)
+            imports, classes, functions = analyze_source(content, str(file_path))
             relative_path = str(file_path.relative_to(self.root_path))
             
-            # Extract imports
-            imports = set()
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.add(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.add(node.module)
-            
             self.imports[relative_path] = imports
             
-            # Extract classes and functions
-            classes = []
-            functions = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, ast.FunctionDef):
-                    if not any(isinstance(parent, ast.ClassDef) for parent in ast.walk(tree)):
-                        functions.append(node.name)
-            
             if classes:
                 self.classes[relative_path] = classes
             if functions:
@@ -60,18 +70,36 @@ class CodeAnalyzer:
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
     
+    def _iter_py_files(self, root: Path) -> Iterator[Path]:
+        """Yield the Python sources under root, skipping tests and setup files.
+
+        Excluded directories are pruned before they are listed, and the
+        checks use the names already returned by os.scandir.
+        """
+        stack = [str(root)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if 'test_' in name:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    elif name.endswith('.py') and name != 'setup.py' and entry.is_file():
+                        yield Path(entry.path)
+
+    def list_sources(self) -> List[str]:
+        """Return the paths of the files analyze_codebase would parse, without parsing them."""
+        return [str(path.relative_to(self.root_path)) for path in self._iter_py_files(self.root_path)]
+
     def analyze_codebase(self) -> None:
         """Analyze all Python files in the codebase."""
-        for file_path in self.root_path.rglob("*.py"):
-            # Skip test files and setup files
-            if any(part in str(file_path) for part in ['test_', 'Tests/', 'setup.py', '__pycache__']):
-                continue
+        for file_path in self._iter_py_files(self.root_path):
             self.analyze_file(file_path)
 
-def generate_dot_file(analyzer: CodeAnalyzer) -> str:
-    """Generate GraphViz DOT content based on code analysis."""
-    
-    dot_content = """digraph PyClaudeCliArchitecture {
+# The diagram is maintained by hand, so its DOT source is a constant
+STATIC_DOT = """digraph PyClaudeCliArchitecture {
     // Graph settings
     rankdir=TB;
     bgcolor="white";
@@ -262,16 +290,19 @@ def generate_dot_file(analyzer: CodeAnalyzer) -> str:
     }
 }
 """
-    
-    return dot_content
+
+def generate_dot_file(analyzer: CodeAnalyzer) -> str:
+    """Return the GraphViz DOT content for the architecture diagram.
+
+    The diagram is static; analyzer is accepted for callers that run the
+    analysis but does not change the output.
+    """
+    return STATIC_DOT
 
 def ensure_graphviz_installed():
     """Check if GraphViz is installed and provide installation instructions if not."""
-    try:
-        result = subprocess.run(['dot', '-V'], capture_output=True, text=True)
-        if result.returncode != 0:
-            raise FileNotFoundError
-    except FileNotFoundError:
+    # A PATH lookup is enough; a broken install still fails when rendering
+    if shutil.which('dot') is None:
         print("GraphViz is not installed. Please install it first:")
         print("\nOn Ubuntu/Debian:")
         print("  sudo apt-get install graphviz")
@@ -283,6 +314,13 @@ def ensure_graphviz_installed():
 
 def main():
     """Main function to generate the architecture diagram."""
+    parser = argparse.ArgumentParser(description="Generate the PyClaudeCli architecture diagram.")
+    parser.add_argument(
+        '--analyze', action='store_true',
+        help="parse every source file to report class and function counts "
+             "(the diagram itself does not depend on them)")
+    args = parser.parse_args()
+    
     # Get the project root directory
     script_dir = Path(__file__).parent
     root_dir = script_dir
@@ -293,58 +331,60 @@ def main():
     # Ensure GraphViz is installed
     ensure_graphviz_installed()
     
-    # Analyze the codebase
+    # Analyze the codebase; parsing is only needed for the detailed counts
     print("\n1. Analyzing codebase structure...")
     analyzer = CodeAnalyzer(root_dir)
-    analyzer.analyze_codebase()
+    if args.analyze:
+        analyzer.analyze_codebase()
+        source_files = list(analyzer.imports)
+    else:
+        source_files = analyzer.list_sources()
     
-    print(f"   - Found {len(analyzer.imports)} Python files")
-    print(f"   - Found {sum(len(c) for c in analyzer.classes.values())} classes")
-    print(f"   - Found {sum(len(f) for f in analyzer.functions.values())} top-level functions")
+    print(f"   - Found {len(source_files)} Python files")
+    if args.analyze:
+        print(f"   - Found {sum(len(c) for c in analyzer.classes.values())} classes")
+        print(f"   - Found {sum(len(f) for f in analyzer.functions.values())} top-level functions")
     
     # Generate DOT file
     print("\n2. Generating DOT file...")
     dot_content = generate_dot_file(analyzer)
     
-    # Create a temporary DOT file
-    dot_file = script_dir / "architecture_temp.dot"
-    with open(dot_file, 'w') as f:
-        f.write(dot_content)
-    print(f"   - Created {dot_file}")
+    print(f"   - Generated {len(dot_content)} bytes of DOT")
     
     # Create Resources directory if it doesn't exist
     resources_dir = root_dir / "Resources"
     resources_dir.mkdir(exist_ok=True)
     
-    # Generate PNG file
-    print("\n3. Generating PNG diagram...")
+    # Render PNG and SVG together, both reading the DOT from stdin
+    print("\n3. Generating PNG and SVG diagrams...")
     output_file = resources_dir / "Arch.png"
+    svg_file = resources_dir / "Arch.svg"
+    commands = [
+        # High-quality PNG
+        ['dot', '-Tpng',
+         '-Gdpi=150',  # Higher DPI for better quality
+         '-Gsize=12,8!',  # Size in inches (! forces exact size)
+         '-Gratio=fill',  # Fill the specified size
+         '-o', str(output_file)],
+        # SVG for scalability
+        ['dot', '-Tsvg', '-o', str(svg_file)],
+    ]
+    dot_bytes = dot_content.encode('utf-8')
     
     try:
-        # Generate high-quality PNG
-        subprocess.run([
-            'dot', '-Tpng', 
-            '-Gdpi=150',  # Higher DPI for better quality
-            '-Gsize=12,8!',  # Size in inches (! forces exact size)
-            '-Gratio=fill',  # Fill the specified size
-            str(dot_file), 
-            '-o', str(output_file)
-        ], check=True)
-        
-        print(f"   - Generated {output_file}")
-        
-        # Also generate SVG for scalability
-        svg_file = resources_dir / "Arch.svg"
-        subprocess.run(['dot', '-Tsvg', str(dot_file), '-o', str(svg_file)], check=True)
-        print(f"   - Generated {svg_file}")
-        
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            renders = [
+                executor.submit(subprocess.run, command, input=dot_bytes, check=True)
+                for command in commands
+            ]
+            for render in renders:
+                render.result()
     except subprocess.CalledProcessError as e:
         print(f"Error generating diagram: {e}")
         sys.exit(1)
-    finally:
-        # Clean up temporary DOT file
-        if dot_file.exists():
-            dot_file.unlink()
+    
+    print(f"   - Generated {output_file}")
+    print(f"   - Generated {svg_file}")
     
     print("\n✅ Architecture diagram generated successfully!")
     print(f"   PNG: {output_file}")
@@ -353,9 +393,9 @@ def main():
     # Display some statistics
     print("\n📊 Codebase Statistics:")
     print(f"   - Entry points: 2")
-    print(f"   - Core modules: {len([f for f in analyzer.imports if 'AI/' in f and 'test' not in f])}")
-    print(f"   - Utility modules: {len([f for f in analyzer.imports if 'utils/' in f])}")
-    print(f"   - Total lines of code: ~{sum(1 for _ in root_dir.rglob('*.py') if 'test' not in str(_)) * 100} (estimated)")
+    print(f"   - Core modules: {len([f for f in source_files if 'AI/' in f and 'test' not in f])}")
+    print(f"   - Utility modules: {len([f for f in source_files if 'utils/' in f])}")
+    print(f"   - Total lines of code: ~{len(source_files) * 100} (estimated)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
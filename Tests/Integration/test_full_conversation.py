@@ -1,52 +1,73 @@
 """Integration tests for full conversation workflows"""
 
 import pytest
-import tempfile
-from pathlib import Path
 from unittest.mock import patch, Mock
 import json
 from ask.cli import main
-from ask.Modes.interactive import InteractiveMode
-from ask.models import Interaction
+from ask.modes.interactive import InteractiveMode
+
+
+def reply(text):
+    """Build a messages.create result carrying a single text block"""
+    return Mock(content=[Mock(type="text", text=text)])
+
+
+@pytest.fixture
+def home_files(monkeypatch, temp_home):
+    """Point every file the CLI reads or writes into the temporary home
+
+    The path constants are expanded when ask.constants is imported, so
+    setting HOME alone is not enough; music and MIDI output are switched off.
+    """
+    from ask.utils import io
+
+    history_file = str(temp_home / ".ask_history")
+    monkeypatch.setattr('ask.cli.HISTORY_FILE', history_file)
+    monkeypatch.setattr('ask.modes.interactive.HISTORY_FILE', history_file)
+    monkeypatch.setattr('ask.modes.interactive.UPLOAD_CACHE_DIR', str(temp_home / ".ask_uploads"))
+    for name, file_name in [
+        ('CONVERSATION_STATE_FILE', ".ask_conversation_state.json"),
+        ('LEGACY_CONVERSATION_STATE_FILE', ".claude_conversation_state.json"),
+        ('CONVERSATION_LOG_FILE', ".ask_conversation.md"),
+        ('CONVERSATION_LOG_ARCHIVE_DIR', ".ask_conversation_archive"),
+        ('CONVERSATION_JOURNAL_FILE', ".ask_conversation_journal")
+    ]:
+        monkeypatch.setattr(io, name, str(temp_home / file_name))
+    monkeypatch.setattr('ask.utils.music.MusicPlayer.is_enabled', classmethod(lambda cls: False))
+    monkeypatch.setattr('ask.utils.midi_music.MidiMusicGenerator.generate_and_save', Mock())
+    return temp_home
 
 
 class TestFullConversation:
     """Test complete conversation workflows"""
     
     @pytest.mark.integration
-    def test_single_query_workflow(self, temp_home, mock_api_key):
+    def test_single_query_workflow(self, home_files, mock_api_key, mock_anthropic):
         """Test a complete single query workflow"""
-        with patch('sys.argv', ['ask', 'What is Python?']):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                # Mock API response
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "content": [{"type": "text", "text": "Python is a programming language"}],
-                    "usage": {"input_tokens": 10, "output_tokens": 20}
-                }
-                mock_post.return_value = mock_response
-                
-                result = main()
-                
-                assert result == 0
-                
-                # Check conversation was saved
-                state_file = temp_home / ".ask_conversation_state.json"
-                assert state_file.exists()
-                
-                with open(state_file) as f:
-                    state = json.load(f)
-                assert len(state) == 1
-                assert state[0]["query"] == "What is Python?"
-                
-                # Check history was saved
-                history_file = temp_home / ".ask_history"
-                assert history_file.exists()
-                assert "What is Python?" in history_file.read_text()
+        mock_anthropic.messages.create.return_value = reply("Python is a programming language")
+        
+        with patch('sys.argv', ['ask', '--no-spinner', 'What is Python?']):
+            result = main()
+        
+        assert result == 0
+        
+        # Check conversation was saved
+        state_file = home_files / ".ask_conversation_state.json"
+        assert state_file.exists()
+        
+        with open(state_file) as f:
+            state = json.load(f)
+        assert len(state) == 1
+        assert state[0]["query"] == "What is Python?"
+        assert state[0]["response"] == "Python is a programming language"
+        
+        # Check history was saved
+        history_file = home_files / ".ask_history"
+        assert history_file.exists()
+        assert "What is Python?" in history_file.read_text()
     
     @pytest.mark.integration
-    def test_interactive_conversation_flow(self, temp_home, mock_api_key):
+    def test_interactive_conversation_flow(self, home_files, mock_api_key, mock_anthropic):
         """Test a multi-turn interactive conversation"""
         queries = [
             "Hello",
@@ -54,64 +75,61 @@ class TestFullConversation:
             "c 1",  # Show last conversation
             "exit"
         ]
+        streams = [
+            ["Hello! ", "How can I help?"],
+            ["Python is ", "a versatile language"]
+        ]
+        
+        def stream(**kwargs):
+            context = Mock()
+            context.__enter__ = Mock(return_value=Mock(text_stream=streams.pop(0)))
+            context.__exit__ = Mock(return_value=False)
+            return context
+        
+        mock_anthropic.messages.stream.side_effect = stream
+        
+        with patch('prompt_toolkit.PromptSession.prompt', side_effect=queries):
+            interactive = InteractiveMode()
+            interactive.run()
+        
+        # Check final state
+        assert len(interactive.interactions) == 2
+        assert interactive.interactions[0].query == "Hello"
+        assert interactive.interactions[0].response == "Hello! How can I help?"
+        assert interactive.interactions[1].query == "Tell me about Python"
+        
+        # The second request carried the first exchange as history
+        messages = mock_anthropic.messages.stream.call_args.kwargs["messages"]
+        assert [m["content"] for m in messages] == [
+            "Hello", "Hello! How can I help?", "Tell me about Python"
+        ]
         
-        with patch('prompt_toolkit.PromptSession.prompt') as mock_prompt:
-            mock_prompt.side_effect = queries
-            
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                # Mock API responses
-                responses = [
-                    {"content": [{"type": "text", "text": "Hello! How can I help?"}]},
-                    {"content": [{"type": "text", "text": "Python is a versatile language"}]}
-                ]
-                
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.side_effect = [
-                    {**resp, "usage": {"input_tokens": 10, "output_tokens": 20}}
-                    for resp in responses
-                ]
-                mock_post.return_value = mock_response
-                
-                interactive = InteractiveMode()
-                interactive.run()
-                
-                # Check final state
-                assert len(interactive.interactions) == 2
-                assert interactive.interactions[0].query == "Hello"
-                assert interactive.interactions[1].query == "Tell me about Python"
+        # Exiting saved the whole conversation and closed the SDK client
+        with open(home_files / ".ask_conversation_state.json") as f:
+            assert len(json.load(f)) == 2
+        mock_anthropic.close.assert_called_once()
     
     @pytest.mark.integration
-    def test_conversation_persistence_across_sessions(self, temp_home, mock_api_key):
+    def test_conversation_persistence_across_sessions(self, home_files, mock_api_key, mock_anthropic):
         """Test that conversations persist across sessions"""
         # First session
-        with patch('sys.argv', ['ask', 'First question']):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "content": [{"type": "text", "text": "First answer"}],
-                    "usage": {"input_tokens": 10, "output_tokens": 10}
-                }
-                mock_post.return_value = mock_response
-                
-                main()
+        mock_anthropic.messages.create.return_value = reply("First answer")
+        with patch('sys.argv', ['ask', '--no-spinner', 'First question']):
+            main()
         
         # Second session
-        with patch('sys.argv', ['ask', 'Second question']):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "content": [{"type": "text", "text": "Second answer"}],
-                    "usage": {"input_tokens": 20, "output_tokens": 10}
-                }
-                mock_post.return_value = mock_response
-                
-                main()
+        mock_anthropic.messages.create.return_value = reply("Second answer")
+        with patch('sys.argv', ['ask', '--no-spinner', 'Second question']):
+            main()
+        
+        # The second request was sent with the first exchange as history
+        messages = mock_anthropic.messages.create.call_args.kwargs["messages"]
+        assert [m["content"] for m in messages] == [
+            "First question", "First answer", "Second question"
+        ]
         
         # Check combined state
-        state_file = temp_home / ".ask_conversation_state.json"
+        state_file = home_files / ".ask_conversation_state.json"
         with open(state_file) as f:
             state = json.load(f)
         
@@ -120,96 +138,79 @@ class TestFullConversation:
         assert state[1]["query"] == "Second question"
     
     @pytest.mark.integration
-    def test_clear_conversation_workflow(self, temp_home, mock_api_key):
+    def test_clear_conversation_workflow(self, home_files, mock_api_key):
         """Test clearing conversation history"""
         # Create initial conversation
         initial_state = [
-            {"query": "old query", "response": "old response", "timestamp": "2024-01-01"}
+            {"query": "old query", "response": "old response", "timestamp": "2024-01-01T00:00:00"}
         ]
         
-        state_file = temp_home / ".ask_conversation_state.json"
-        with open(state_file, 'w') as f:
+        config_dir = home_files / ".config" / "claude"
+        config_dir.mkdir(parents=True)
+        with open(config_dir / "conversations.json", 'w') as f:
             json.dump(initial_state, f)
         
         # Clear conversation
         with patch('sys.argv', ['ask', 'clear']):
             result = main()
-            assert result == 0
+        assert result == 0
         
         # Check state was cleared
-        with open(state_file) as f:
+        with open(config_dir / "conversations.json") as f:
             state = json.load(f)
         assert state == []
     
     @pytest.mark.integration
-    def test_file_upload_workflow(self, temp_home, mock_api_key, test_files):
+    def test_file_upload_workflow(self, home_files, mock_api_key, mock_anthropic, test_files):
         """Test file upload workflow"""
         test_file = test_files["text"]
         
-        with patch('sys.argv', ['ask', 'upload', str(test_file)]):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "content": [{"type": "text", "text": "I see the uploaded file"}],
-                    "usage": {"input_tokens": 50, "output_tokens": 10}
-                }
-                mock_post.return_value = mock_response
-                
-                with patch('builtins.print') as mock_print:
-                    result = main()
-                
-                assert result == 0
-                
-                # Check upload was mentioned
-                output = ' '.join(str(call) for call in mock_print.call_args_list)
-                assert "uploaded" in output.lower()
+        with patch('sys.argv', ['ask', 'upload', str(test_file)]), \
+                patch('builtins.input', return_value="Summarize this"), \
+                patch('builtins.print') as mock_print:
+            result = main()
+        
+        assert result == 0
+        
+        # The text file was sent with the message
+        messages = mock_anthropic.messages.stream.call_args.kwargs["messages"]
+        assert messages[-1]["content"].startswith("Summarize this\n\n")
+        assert "This is a test file" in messages[-1]["content"]
+        
+        # Check the text file was mentioned
+        output = ' '.join(str(call) for call in mock_print.call_args_list)
+        assert "text files will be included" in output.lower()
     
     @pytest.mark.integration
-    def test_error_recovery_workflow(self, temp_home, mock_api_key):
-        """Test error recovery in conversation"""
-        with patch('sys.argv', ['ask', 'Test query']):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                # First call fails, second succeeds
-                mock_response_fail = Mock()
-                mock_response_fail.status_code = 500
-                mock_response_fail.raise_for_status.side_effect = Exception("Server error")
-                
-                mock_response_success = Mock()
-                mock_response_success.status_code = 200
-                mock_response_success.json.return_value = {
-                    "content": [{"type": "text", "text": "Success after retry"}],
-                    "usage": {"input_tokens": 10, "output_tokens": 10}
-                }
-                
-                mock_post.side_effect = [mock_response_fail, mock_response_success]
-                
-                # For this test, we expect it to fail without retry logic
-                # This is where retry logic would be implemented
-                result = main()
-                assert result == 1  # Should fail
+    def test_error_recovery_workflow(self, home_files, mock_api_key, mock_anthropic):
+        """Test that a failed request is reported and nothing is saved"""
+        mock_anthropic.messages.create.side_effect = Exception("Server error")
+        
+        with patch('sys.argv', ['ask', '--no-spinner', 'Test query']), \
+                patch('builtins.print') as mock_print:
+            result = main()
+        
+        # There is no retry logic; the error is shown as the response
+        assert result == 0
+        output = ' '.join(str(call) for call in mock_print.call_args_list)
+        assert "Server error" in output
+        
+        state_file = home_files / ".ask_conversation_state.json"
+        with open(state_file) as f:
+            assert json.load(f) == []
     
     @pytest.mark.integration
-    def test_conversation_log_creation(self, temp_home, mock_api_key):
+    def test_conversation_log_creation(self, home_files, mock_api_key, mock_anthropic):
         """Test markdown conversation log creation"""
-        with patch('sys.argv', ['ask', 'Log this conversation']):
-            with patch('ask.Api.client.httpx.post') as mock_post:
-                mock_response = Mock()
-                mock_response.status_code = 200
-                mock_response.json.return_value = {
-                    "content": [{"type": "text", "text": "This will be logged"}],
-                    "usage": {"input_tokens": 10, "output_tokens": 10}
-                }
-                mock_post.return_value = mock_response
-                
-                main()
+        mock_anthropic.messages.create.return_value = reply("This will be logged")
+        
+        with patch('sys.argv', ['ask', '--no-spinner', 'Log this conversation']):
+            main()
         
         # Check markdown log was created
-        log_file = temp_home / ".ask_conversation.md"
+        log_file = home_files / ".ask_conversation.md"
         assert log_file.exists()
         
         content = log_file.read_text()
-        assert "Log this conversation" in content
-        assert "This will be logged" in content
-        assert "## User" in content
-        assert "## Assistant" in content
\ No newline at end of file
+        assert "**User**: Log this conversation" in content
+        assert "**Claude**: This will be logged" in content
@@ -32,6 +32,8 @@ class TestVariableIntegration(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test environment"""
+        # Write any pending save now so its timer can't recreate the file
+        self.vm.flush()
         if os.path.exists(self.temp_path):
             os.unlink(self.temp_path)
     
@@ -58,14 +60,14 @@ class TestVariableIntegration(unittest.TestCase):
         mock_vm.process_input.return_value = ("Hello John", False)
         mock_client_instance = MagicMock()
         mock_client.return_value = mock_client_instance
-        mock_client_instance.generate_response.return_value = ("AI response", [])
+        mock_client_instance.stream_response.return_value = iter(["AI response"])
         
         # Create interactive mode instance
         interactive = InteractiveMode()
         
         # Test variable interpolation
-        with patch('ask.modes.interactive.Spinner'), \
-             patch('ask.modes.interactive.print_response'), \
+        with patch.object(interactive, 'spinner'), \
+             patch('ask.modes.interactive.print_response_intro'), \
              patch('ask.modes.interactive.save_conversation_state'), \
              patch('ask.modes.interactive.append_to_conversation_log'):
             
@@ -74,10 +76,10 @@ class TestVariableIntegration(unittest.TestCase):
         # Should process variables and then send to AI
         self.assertTrue(result)
         mock_vm.process_input.assert_called_once_with("Hello name")
-        mock_client_instance.generate_response.assert_called_once()
+        mock_client_instance.stream_response.assert_called_once()
         
         # Check that the interpolated text was passed to AI
-        call_args = mock_client_instance.generate_response.call_args[0]
+        call_args = mock_client_instance.stream_response.call_args[0]
         self.assertEqual(call_args[0], "Hello John")  # First argument should be the interpolated text
     
     @patch('ask.modes.interactive.ClaudeClient')
@@ -167,6 +169,8 @@ class TestVariableIntegration(unittest.TestCase):
             result, was_assignment = vm.process_input(input_text)
             self.assertFalse(was_assignment, f"'{input_text}' should not be assignment")
             self.assertEqual(result, expected, f"Interpolation failed for '{input_text}'")
+        
+        vm.flush()
     
     def test_help_command_includes_variables(self):
         """Test that help command includes variable-related help"""
@@ -202,6 +206,8 @@ class TestVariableIntegration(unittest.TestCase):
         self.assertEqual(result2, "Users: [{'name': 'Alice'}, {'name': 'Bob'}]")
         self.assertEqual(result3, "Flag is True")
         self.assertEqual(result4, "Count: None")
+        
+        vm.flush()
     
     def test_error_recovery(self):
         """Test error recovery in variable system"""
@@ -227,6 +233,8 @@ class TestVariableIntegration(unittest.TestCase):
         
         # Check that valid assignment worked
         self.assertEqual(vm.get_variable("valid"), "works")
+        
+        vm.flush()
 
 
 if __name__ == '__main__':
@@ -1,44 +1,39 @@
 """Unit tests for the Claude API client"""
 
+import threading
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
-import json
-import httpx
-from ask.Api.client import ClaudeClient
+from unittest.mock import Mock
+from ask.api.client import ClaudeClient
+from ask.constants import DEFAULT_MAX_TOKENS, DEFAULT_MODEL, DEFAULT_SYSTEM_PROMPT, FILES_API_BETA
+from ask.models import Interaction
+from ask.utils import io
+
+
+def reply(text):
+    """Build a messages.create result carrying a single text block"""
+    return Mock(content=[Mock(type="text", text=text)])
 
 
 class TestClaudeClient:
     """Test cases for ClaudeClient"""
     
     @pytest.fixture
-    def client(self, mock_api_key):
-        """Create a ClaudeClient instance with mocked API key"""
+    def client(self, mock_api_key, mock_anthropic):
+        """Create a ClaudeClient instance backed by the mocked SDK"""
         return ClaudeClient()
     
-    def test_client_initialization(self, client):
+    def test_client_initialization(self, client, mock_api_key, mock_anthropic):
         """Test client initializes with correct defaults"""
-        assert client.model == "claude-3-5-sonnet-20241022"
-        assert client.max_tokens == 1024
-        assert client.base_url == "https://api.anthropic.com/v1/messages"
-    
-    def test_headers_include_api_key(self, client, mock_api_key):
-        """Test that headers include the API key"""
-        headers = client._get_headers()
-        assert headers["x-api-key"] == mock_api_key
-        assert headers["anthropic-version"] == "2023-06-01"
-        assert headers["content-type"] == "application/json"
-    
-    @patch('httpx.post')
-    def test_generate_response_success(self, mock_post, client):
+        import anthropic
+        
+        assert client.model == DEFAULT_MODEL
+        assert client.api_key == mock_api_key
+        assert client.client is mock_anthropic
+        anthropic.Anthropic.assert_called_once_with(api_key=mock_api_key)
+    
+    def test_generate_response_success(self, client, mock_anthropic):
         """Test successful response generation"""
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "content": [{"type": "text", "text": "Hello, world!"}],
-            "usage": {"input_tokens": 10, "output_tokens": 20}
-        }
-        mock_post.return_value = mock_response
+        mock_anthropic.messages.create.return_value = reply("Hello, world!")
         
         query = "Say hello"
         response, interactions = client.generate_response(query)
@@ -49,127 +44,221 @@ class TestClaudeClient:
         assert interactions[0].response == "Hello, world!"
         
         # Verify API was called correctly
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert call_args[0][0] == client.base_url
-        assert "messages" in call_args[1]["json"]
+        mock_anthropic.messages.create.assert_called_once_with(
+            model=DEFAULT_MODEL,
+            system=DEFAULT_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": query}],
+            max_tokens=DEFAULT_MAX_TOKENS
+        )
     
-    @patch('httpx.post')
-    def test_generate_response_with_system_prompt(self, mock_post, client):
+    def test_generate_response_with_system_prompt(self, client, mock_anthropic):
         """Test response generation with custom system prompt"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "content": [{"type": "text", "text": "Response"}],
-            "usage": {"input_tokens": 10, "output_tokens": 5}
-        }
-        mock_post.return_value = mock_response
-        
         system_prompt = "You are a helpful coding assistant"
-        query = "Help me write a function"
         
-        response, _ = client.generate_response(
-            query, 
-            system_prompt=system_prompt
-        )
+        client.generate_response("Help me write a function", system_prompt=system_prompt)
         
         # Verify system prompt was included
-        call_args = mock_post.call_args[1]["json"]
-        assert call_args["system"] == system_prompt
+        call_kwargs = mock_anthropic.messages.create.call_args.kwargs
+        assert call_kwargs["system"] == system_prompt
     
-    @patch('httpx.post')
-    def test_generate_response_with_existing_interactions(self, mock_post, client, sample_conversation):
+    def test_generate_response_with_existing_interactions(self, client, mock_anthropic, sample_conversation):
         """Test response generation with conversation history"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "content": [{"type": "text", "text": "New response"}],
-            "usage": {"input_tokens": 50, "output_tokens": 10}
-        }
-        mock_post.return_value = mock_response
+        mock_anthropic.messages.create.return_value = reply("New response")
+        history = [Interaction.from_dict(item) for item in sample_conversation]
         
         query = "Tell me more"
-        response, interactions = client.generate_response(
-            query,
-            interactions=sample_conversation
-        )
+        response, interactions = client.generate_response(query, interactions=history)
         
         assert response == "New response"
         assert len(interactions) == len(sample_conversation) + 1
         assert interactions[-1].query == query
         assert interactions[-1].response == "New response"
+        
+        # Earlier turns are sent as alternating user/assistant messages
+        messages = mock_anthropic.messages.create.call_args.kwargs["messages"]
+        assert [m["role"] for m in messages] == ["user", "assistant", "user", "assistant", "user"]
+        assert messages[0]["content"] == "What is Python?"
+        assert messages[-1]["content"] == query
     
-    @patch('httpx.post')
-    def test_api_error_handling(self, mock_post, client):
-        """Test handling of API errors"""
-        mock_response = Mock()
-        mock_response.status_code = 429
-        mock_response.json.return_value = {
-            "error": {"message": "Rate limit exceeded"}
-        }
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "429 Too Many Requests",
-            request=Mock(),
-            response=mock_response
-        )
-        mock_post.return_value = mock_response
+    def test_api_error_handling(self, client, mock_anthropic):
+        """Test that API errors are reported without touching the history"""
+        mock_anthropic.messages.create.side_effect = Exception("Rate limit exceeded")
+        
+        response, interactions = client.generate_response("test")
+        
+        assert response == "Error while generating response: Rate limit exceeded"
+        assert interactions == []
+    
+    def test_max_tokens_configuration(self, client, mock_anthropic):
+        """Test max_tokens parameter is passed correctly"""
+        client.generate_response("test", max_tokens=2048)
         
-        with pytest.raises(Exception) as exc_info:
-            client.generate_response("test")
+        call_kwargs = mock_anthropic.messages.create.call_args.kwargs
+        assert call_kwargs["max_tokens"] == 2048
+    
+    def test_stream_response(self, client, mock_anthropic):
+        """Test that streamed chunks are yielded and then recorded"""
+        stream = mock_anthropic.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = ["Hello", ", ", "world"]
+        interactions = []
+        
+        chunks = list(client.stream_response("Say hello", interactions=interactions))
         
-        assert "429" in str(exc_info.value) or "Rate limit" in str(exc_info.value)
+        assert chunks == ["Hello", ", ", "world"]
+        assert interactions == [Interaction(
+            query="Say hello", response="Hello, world", timestamp=interactions[0].timestamp
+        )]
     
-    @patch('httpx.post')
-    def test_network_error_handling(self, mock_post, client):
-        """Test handling of network errors"""
-        mock_post.side_effect = httpx.ConnectError("Network error")
+    def test_stream_response_error(self, client, mock_anthropic):
+        """Test that a failed stream yields the error and records nothing"""
+        mock_anthropic.messages.stream.side_effect = Exception("Network error")
+        interactions = []
+        
+        chunks = list(client.stream_response("test", interactions=interactions))
         
-        with pytest.raises(Exception) as exc_info:
-            client.generate_response("test")
+        assert chunks == ["Error while generating response: Network error"]
+        assert interactions == []
+    
+    def test_context_manager_closes_sdk_client(self, client, mock_anthropic):
+        """Test that leaving the with block closes the SDK's HTTP pool"""
+        with client as entered:
+            assert entered is client
+            mock_anthropic.close.assert_not_called()
         
-        assert "Network error" in str(exc_info.value)
+        mock_anthropic.close.assert_called_once()
     
-    def test_missing_api_key(self, monkeypatch):
+    def test_missing_api_key(self, monkeypatch, tmp_path, mock_anthropic):
         """Test error when API key is missing"""
         monkeypatch.delenv("CLAUDE_API_KEY", raising=False)
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.setattr(io, 'TOKEN_FILE', str(tmp_path / "missing"))
+        monkeypatch.setattr(io, 'LEGACY_TOKEN_FILE', str(tmp_path / "missing_legacy"))
+        
+        with pytest.raises(FileNotFoundError) as exc_info:
+            ClaudeClient()
         
-        # Mock both token file paths to not exist
-        with patch('os.path.exists') as mock_exists:
-            mock_exists.return_value = False
-            
-            with pytest.raises(ValueError) as exc_info:
-                ClaudeClient()
-            
-            assert "API key" in str(exc_info.value)
+        assert "CLAUDE_API_KEY" in str(exc_info.value)
     
-    def test_token_from_file(self, monkeypatch, tmp_path):
+    def test_token_from_file(self, monkeypatch, tmp_path, mock_anthropic):
         """Test reading API key from token file"""
         monkeypatch.delenv("CLAUDE_API_KEY", raising=False)
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         
-        # Create a mock token file
+        # Create a token file
         token_file = tmp_path / ".claude_token"
-        token_file.write_text("file-api-key-123")
+        token_file.write_text("file-api-key-123\n")
+        monkeypatch.setattr(io, 'TOKEN_FILE', str(token_file))
+        
+        client = ClaudeClient()
         
-        with patch('os.path.expanduser') as mock_expand:
-            mock_expand.return_value = str(token_file)
-            
-            client = ClaudeClient()
-            headers = client._get_headers()
-            assert headers["x-api-key"] == "file-api-key-123"
+        assert client.api_key == "file-api-key-123"
+
+
+class TestFilesApi:
+    """Test cases for sending large files through the Files API"""
     
-    @patch('httpx.post')
-    def test_max_tokens_configuration(self, mock_post, client):
-        """Test max_tokens parameter is passed correctly"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "content": [{"type": "text", "text": "Response"}],
-            "usage": {"input_tokens": 10, "output_tokens": 5}
+    @pytest.fixture
+    def client(self, mock_api_key, mock_anthropic):
+        """Create a ClaudeClient instance backed by the mocked SDK"""
+        return ClaudeClient()
+    
+    @pytest.fixture
+    def image_files(self, tmp_path):
+        """Create one small and one large image file object"""
+        files = []
+        for name, size in [("small.png", 10), ("large.png", 1000)]:
+            path = tmp_path / name
+            path.write_bytes(b"\x89PNG" + b"\0" * (size - 4))
+            files.append({
+                "file_path": str(path),
+                "file_name": name,
+                "mime_type": "image/png",
+                "size": size
+            })
+        return files
+    
+    def test_upload_large_files(self, client, mock_anthropic, image_files):
+        """Test that only files above the threshold are uploaded"""
+        small, large = image_files
+        mock_anthropic.beta.files.upload.return_value = Mock(id="file_123")
+        
+        assert client.upload_large_files(image_files, threshold=100) == 1
+        
+        assert large["file_id"] == "file_123"
+        assert "file_id" not in small
+        upload_kwargs = mock_anthropic.beta.files.upload.call_args.kwargs
+        assert upload_kwargs["file"][0] == "large.png"
+        assert upload_kwargs["file"][2] == "image/png"
+        assert upload_kwargs["betas"] == [FILES_API_BETA]
+    
+    def test_failed_upload_stays_inline(self, client, mock_anthropic, image_files):
+        """Test that a file whose upload fails is left without a file_id"""
+        mock_anthropic.beta.files.upload.side_effect = Exception("Upload failed")
+        
+        assert client.upload_large_files(image_files, threshold=100) == 0
+        assert all("file_id" not in file_obj for file_obj in image_files)
+    
+    def test_uploaded_file_sent_by_reference(self, client, mock_anthropic, image_files):
+        """Test that an uploaded file is referenced through the beta endpoint"""
+        small, large = image_files
+        mock_anthropic.beta.files.upload.return_value = Mock(id="file_123")
+        mock_anthropic.beta.messages.create.return_value = reply("A large image")
+        client.upload_large_files(image_files, threshold=100)
+        
+        response, _ = client.generate_response("Describe these", files=image_files)
+        
+        assert response == "A large image"
+        mock_anthropic.messages.create.assert_not_called()
+        call_kwargs = mock_anthropic.beta.messages.create.call_args.kwargs
+        assert call_kwargs["betas"] == [FILES_API_BETA]
+        
+        text, small_block, large_block = call_kwargs["messages"][-1]["content"]
+        assert text == {"type": "text", "text": "Describe these"}
+        assert small_block["source"]["type"] == "base64"
+        assert large_block == {
+            "type": "image",
+            "source": {"type": "file", "file_id": "file_123"}
         }
-        mock_post.return_value = mock_response
+    
+    def test_small_files_stay_inline(self, client, mock_anthropic, image_files):
+        """Test that files below the threshold are sent inline on the normal endpoint"""
+        client.upload_large_files(image_files, threshold=10_000)
+        
+        client.generate_response("Describe these", files=image_files)
         
-        client.max_tokens = 2048
-        client.generate_response("test")
+        mock_anthropic.beta.files.upload.assert_not_called()
+        mock_anthropic.beta.messages.create.assert_not_called()
+        call_kwargs = mock_anthropic.messages.create.call_args.kwargs
+        assert "betas" not in call_kwargs
+        blocks = call_kwargs["messages"][-1]["content"][1:]
+        assert [block["source"]["type"] for block in blocks] == ["base64", "base64"]
+        assert blocks[0]["source"]["media_type"] == "image/png"
+    
+    def test_delete_uploaded_files(self, client, mock_anthropic):
+        """Test that every uploaded file is deleted concurrently despite a failure"""
+        files = [{"file_name": f"{n}.png", "file_id": f"file_{n}"} for n in range(3)]
+        files.append({"file_name": "inline.png"})
+        # Every delete waits here until all three are in flight at once
+        barrier = threading.Barrier(3, timeout=5)
+        met = []
+        
+        def delete(file_id, betas):
+            barrier.wait()
+            met.append(file_id)
+            if file_id == "file_1":
+                raise Exception("Delete failed")
+        
+        mock_anthropic.beta.files.delete.side_effect = delete
+        
+        client.delete_uploaded_files(files)
+        
+        assert sorted(met) == ["file_0", "file_1", "file_2"]
+        assert all("file_id" not in file_obj for file_obj in files)
+        for call in mock_anthropic.beta.files.delete.call_args_list:
+            assert call.kwargs["betas"] == [FILES_API_BETA]
+    
+    def test_delete_without_uploads(self, client, mock_anthropic):
+        """Test that nothing is deleted when no file was uploaded"""
+        client.delete_uploaded_files([{"file_name": "inline.png"}])
         
-        call_args = mock_post.call_args[1]["json"]
-        assert call_args["max_tokens"] == 2048
\ No newline at end of file
+        mock_anthropic.beta.files.delete.assert_not_called()
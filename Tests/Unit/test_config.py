@@ -29,6 +29,7 @@ class TestConfigClasses:
         assert config.temperature == 0.7
         assert config.timeout == 30
         assert config.max_retries == 3
+        assert config.max_connections == 100
         assert config.base_url is None
     
     def test_ui_config_defaults(self):
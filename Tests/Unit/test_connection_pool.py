@@ -0,0 +1,131 @@
+"""
+Tests for connection pool rate limiting
+"""
+
+import pytest
+from types import SimpleNamespace
+from ask.utils.connection_pool import ConnectionPool, RateLimitConfig
+
+SECOND_NS = 1_000_000_000
+
+
+def make_limits(per_minute=2, per_hour=3600, per_day=50000):
+    """Create a RateLimitConfig whose buckets were last refilled at time 0."""
+    return RateLimitConfig(
+        max_requests_per_minute=per_minute,
+        max_requests_per_hour=per_hour,
+        max_requests_per_day=per_day,
+        last_refill_ns=0,
+    )
+
+
+class TestRateLimitConfig:
+    """Test the token bucket rate limiter."""
+
+    def test_starts_full(self):
+        """Test that a new limiter allows a request without waiting."""
+        limits = make_limits()
+        assert limits.can_make_request(now_ns=0) is True
+        assert limits.get_wait_time(now_ns=0) == 0.0
+
+    def test_burst_then_exhausted(self):
+        """Test that a full bucket allows a burst of its limit, then blocks."""
+        limits = make_limits(per_minute=2)
+        limits.record_request(now_ns=0)
+        limits.record_request(now_ns=0)
+
+        assert limits.can_make_request(now_ns=0) is False
+        # One token refills every 30 seconds at 2 requests per minute
+        assert limits.get_wait_time(now_ns=0) == pytest.approx(30.0)
+
+    def test_refill_over_time(self):
+        """Test that tokens refill continuously at limit per period."""
+        limits = make_limits(per_minute=2)
+        limits.record_request(now_ns=0)
+        limits.record_request(now_ns=0)
+
+        # Half a token after 15 seconds
+        assert limits.get_wait_time(now_ns=15 * SECOND_NS) == pytest.approx(15.0)
+        assert limits.can_make_request(now_ns=15 * SECOND_NS) is False
+
+        # A whole token after 30 seconds
+        assert limits.get_wait_time(now_ns=30 * SECOND_NS) == 0.0
+        assert limits.can_make_request(now_ns=30 * SECOND_NS) is True
+
+    def test_refill_capped_at_limit(self):
+        """Test that idle time does not bank more than one burst."""
+        limits = make_limits(per_minute=2)
+        limits.record_request(now_ns=0)
+
+        later = 600 * SECOND_NS
+        limits.record_request(now_ns=later)
+        limits.record_request(now_ns=later)
+
+        assert limits.can_make_request(now_ns=later) is False
+
+    def test_try_acquire(self):
+        """Test that try_acquire takes a token only when one is available."""
+        limits = make_limits(per_minute=2)
+
+        assert limits.try_acquire(now_ns=0) is True
+        assert limits.try_acquire(now_ns=0) is True
+        assert limits.try_acquire(now_ns=0) is False
+        assert limits.minute_tokens == 0
+
+        # The refused attempt took nothing, so one token is back in 30 seconds
+        assert limits.try_acquire(now_ns=30 * SECOND_NS) is True
+
+    def test_record_request_clamped_at_zero(self):
+        """Test that recording past an empty bucket does not go negative."""
+        limits = make_limits(per_minute=2)
+        for _ in range(5):
+            limits.record_request(now_ns=0)
+
+        assert limits.minute_tokens == 0
+        # The wait is for one token, not for the three requests over the limit
+        assert limits.get_wait_time(now_ns=0) == pytest.approx(30.0)
+        assert limits.can_make_request(now_ns=30 * SECOND_NS) is True
+
+    def test_slowest_bucket_sets_wait(self):
+        """Test that the wait covers the bucket that refills slowest."""
+        limits = make_limits(per_minute=100, per_hour=1)
+        limits.record_request(now_ns=0)
+
+        assert limits.can_make_request(now_ns=0) is False
+        assert limits.get_wait_time(now_ns=0) == pytest.approx(3600.0)
+
+    @pytest.mark.parametrize("field", [
+        "max_requests_per_minute",
+        "max_requests_per_hour",
+        "max_requests_per_day"
+    ])
+    def test_non_positive_limit_rejected(self, field):
+        """Test that a zero limit is rejected instead of dividing by zero later."""
+        with pytest.raises(ValueError, match=field):
+            RateLimitConfig(**{field: 0})
+
+
+class TestConnectionPoolStats:
+    """Test connection statistics read from the connector."""
+
+    def test_counts_from_connector(self):
+        """Test that active and idle counts come from the connector's pools."""
+        pool = ConnectionPool()
+        pool._connector = SimpleNamespace(
+            _acquired={"a", "b"}, _conns={"host1": [1, 2], "host2": [3]}
+        )
+
+        stats = pool.get_stats()
+
+        assert stats.active_connections == 2
+        assert stats.idle_connections == 3
+
+    def test_connector_without_private_fields(self):
+        """Test that a connector lacking aiohttp internals reports zero."""
+        pool = ConnectionPool()
+        pool._connector = SimpleNamespace()
+
+        stats = pool.get_stats()
+
+        assert stats.active_connections == 0
+        assert stats.idle_connections == 0
@@ -0,0 +1,109 @@
+"""Unit tests for the conversation journal"""
+
+import pytest
+from collections import Counter
+from ask.utils import io
+from ask.utils.io import (
+    clear_conversation_journal,
+    journal_interaction,
+    load_conversation_state,
+    read_conversation_journal,
+    save_conversation_state,
+)
+from ask.models import Interaction
+
+
+class TestConversationJournal:
+    """Test cases for journaling interactions between full saves"""
+
+    @pytest.fixture
+    def journal_file(self, monkeypatch, temp_home):
+        """Point the journal and legacy state file into a temporary home"""
+        journal_file = temp_home / ".ask_conversation_journal"
+        monkeypatch.setattr(io, 'CONVERSATION_JOURNAL_FILE', str(journal_file))
+        monkeypatch.setattr(io, '_journaled_lines', Counter())
+        monkeypatch.setattr(io, 'CONVERSATION_STATE_FILE', str(temp_home / "state.json"))
+        monkeypatch.setattr(io, 'LEGACY_CONVERSATION_STATE_FILE', str(temp_home / "legacy.json"))
+        return journal_file
+
+    def test_read_missing_journal(self, journal_file):
+        """Test that a missing journal reads as empty"""
+        assert read_conversation_journal() == []
+
+    def test_append(self, journal_file):
+        """Test that each journaled interaction is appended as one line"""
+        first = Interaction(query="q1", response="r1")
+        second = Interaction(query="q2", response="r2")
+
+        journal_interaction(first)
+        journal_interaction(second)
+
+        assert len(journal_file.read_bytes().splitlines()) == 2
+        assert read_conversation_journal() == [first, second]
+
+    def test_replay_after_crash(self, journal_file):
+        """Test that turns journaled after the last save are replayed on load"""
+        saved = Interaction(query="saved", response="in snapshot")
+        save_conversation_state([saved])
+
+        # A crash here leaves the journal newer than the snapshot
+        unsaved = Interaction(query="unsaved", response="only journaled")
+        journal_interaction(unsaved)
+
+        assert load_conversation_state() == [saved, unsaved]
+
+    def test_replayed_turns_cleared_by_next_save(self, journal_file):
+        """Test that turns replayed after a crash are not replayed again"""
+        saved = Interaction(query="saved", response="in snapshot")
+        save_conversation_state([saved])
+        with open(journal_file, "ab") as f:
+            f.write(io.fast_json.dumps({"query": "crashed", "response": "r"}) + b"\n")
+
+        save_conversation_state(load_conversation_state())
+
+        assert read_conversation_journal() == []
+        assert [i.query for i in load_conversation_state()] == ["saved", "crashed"]
+
+    def test_truncated_last_line(self, journal_file):
+        """Test that a write cut short by a crash is skipped"""
+        complete = Interaction(query="complete", response="r")
+        journal_interaction(complete)
+        with open(journal_file, "ab") as f:
+            f.write(b'{"query": "partial", "resp')
+
+        assert read_conversation_journal() == [complete]
+
+    def test_clear_after_full_save(self, journal_file):
+        """Test that a full save folds the journal into the snapshot"""
+        interactions = [
+            Interaction(query="q1", response="r1"),
+            Interaction(query="q2", response="r2")
+        ]
+        for interaction in interactions:
+            journal_interaction(interaction)
+
+        save_conversation_state(interactions)
+
+        assert journal_file.read_bytes() == b""
+        # Nothing is replayed twice
+        assert load_conversation_state() == interactions
+
+    def test_clear_keeps_other_sessions(self, journal_file):
+        """Test that a full save keeps turns journaled by a concurrent session"""
+        ours = Interaction(query="ours", response="r")
+        theirs = Interaction(query="theirs", response="r")
+        journal_interaction(ours)
+        # Another process appends between our journal write and our save
+        with open(journal_file, "ab") as f:
+            f.write(io.fast_json.dumps(theirs.to_dict()) + b"\n")
+        journal_interaction(ours)
+
+        save_conversation_state([ours, ours])
+
+        assert read_conversation_journal() == [theirs]
+
+    def test_clear_missing_journal(self, journal_file):
+        """Test that clearing without a journal is a no-op"""
+        clear_conversation_journal()
+
+        assert not journal_file.exists()
@@ -0,0 +1,88 @@
+"""Unit tests for the markdown conversation log"""
+
+import os
+import pytest
+from datetime import datetime, timedelta
+from ask.utils import io
+from ask.utils.io import append_to_conversation_log
+from ask.models import Interaction
+
+
+def previous_month():
+    """Return a datetime in the month before the current one"""
+    return datetime.now().replace(day=1, hour=12) - timedelta(days=1)
+
+
+class TestConversationLog:
+    """Test cases for conversation log writing and monthly rotation"""
+
+    @pytest.fixture
+    def log_paths(self, monkeypatch, tmp_path):
+        """Point the live log and archive directory into tmp_path"""
+        log_file = tmp_path / "conversation.md"
+        archive_dir = tmp_path / "archive"
+        monkeypatch.setattr(io, 'CONVERSATION_LOG_FILE', str(log_file))
+        monkeypatch.setattr(io, 'CONVERSATION_LOG_ARCHIVE_DIR', str(archive_dir))
+        return log_file, archive_dir
+
+    def backdate(self, path, when):
+        """Set a file's access and modification time"""
+        timestamp = when.timestamp()
+        os.utime(path, (timestamp, timestamp))
+
+    def test_append_creates_log(self, log_paths):
+        """Test that the first entry starts a log with a header"""
+        log_file, archive_dir = log_paths
+
+        append_to_conversation_log(Interaction(query="hello", response="hi"))
+
+        content = log_file.read_text()
+        assert content.startswith("# AI Conversation Log\n\n")
+        assert "**User**: hello" in content
+        assert "**Claude**: hi" in content
+        assert not archive_dir.exists()
+
+    def test_append_current_month(self, log_paths):
+        """Test that a log from this month is appended to, not rotated"""
+        log_file, archive_dir = log_paths
+
+        append_to_conversation_log(Interaction(query="first", response="r"))
+        append_to_conversation_log(Interaction(query="second", response="r"))
+
+        content = log_file.read_text()
+        assert content.count("# AI Conversation Log") == 1
+        assert "first" in content and "second" in content
+        assert not archive_dir.exists()
+
+    def test_rotate_previous_month(self, log_paths):
+        """Test that last month's log is archived and a fresh log is started"""
+        log_file, archive_dir = log_paths
+        append_to_conversation_log(Interaction(query="old query", response="r"))
+        last_month = previous_month()
+        self.backdate(log_file, last_month)
+
+        append_to_conversation_log(Interaction(query="new query", response="r"))
+
+        archive_file = archive_dir / f"{last_month:%Y-%m}.md"
+        assert os.listdir(archive_dir) == [archive_file.name]
+        assert "old query" in archive_file.read_text()
+
+        content = log_file.read_text()
+        assert content.startswith("# AI Conversation Log\n\n")
+        assert "new query" in content
+        assert "old query" not in content
+
+    def test_rotate_merges_existing_archive(self, log_paths):
+        """Test that rotating into an existing archive appends to it"""
+        log_file, archive_dir = log_paths
+        last_month = previous_month()
+        archive_dir.mkdir()
+        archive_file = archive_dir / f"{last_month:%Y-%m}.md"
+        archive_file.write_text("earlier entries\n")
+        log_file.write_text("later entries\n")
+        self.backdate(log_file, last_month)
+
+        append_to_conversation_log(Interaction(query="new query", response="r"))
+
+        assert archive_file.read_text() == "earlier entries\nlater entries\n"
+        assert "later entries" not in log_file.read_text()
@@ -1,20 +1,29 @@
 """Unit tests for interactive mode functionality"""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from pathlib import Path
-from ask.Modes.interactive import InteractiveMode
+from ask.modes.interactive import InteractiveMode
 from ask.models import Interaction
 
 
+def fake_stream(*chunks):
+    """Build a stream_response side effect that records the exchange like ClaudeClient"""
+    def stream(prompt, system_prompt, interactions, *args, **kwargs):
+        yield from chunks
+        interactions.append(Interaction(query=prompt, response="".join(chunks)))
+    return stream
+
+
 class TestInteractiveMode:
     """Test cases for InteractiveMode"""
     
     @pytest.fixture
-    def interactive_mode(self, mock_api_key):
+    def interactive_mode(self, mock_api_key, claude_client_mock):
         """Create an InteractiveMode instance"""
-        with patch('ask.Modes.interactive.ClaudeClient'):
-            return InteractiveMode()
+        with patch('ask.modes.interactive.ClaudeClient', return_value=claude_client_mock):
+            with patch('ask.modes.interactive.load_conversation_state_with_timeout', return_value=[]):
+                return InteractiveMode()
     
     def test_initialization(self, interactive_mode):
         """Test interactive mode initialization"""
@@ -22,128 +31,136 @@ class TestInteractiveMode:
         assert interactive_mode.client is not None
         assert isinstance(interactive_mode.interactions, list)
     
-    @patch('ask.Modes.interactive.PromptSession')
-    def test_command_parsing_exit(self, mock_prompt_session, interactive_mode):
-        """Test exit command detection"""
-        # Test various exit commands
-        for cmd in ['exit', 'quit', 'EXIT', 'QUIT']:
-            assert interactive_mode._should_exit(cmd) is True
+    @pytest.mark.parametrize("cmd,should_exit", [
+        ('exit', True),
+        ('quit', True),
+        ('EXIT', True),
+        ('QUIT', True),
+        ('help', False),
+        ('what is exit?', False)
+    ])
+    def test_command_parsing_exit(self, interactive_mode, cmd, should_exit):
+        """Test that only exit aliases stop the main loop"""
+        with patch('ask.modes.interactive.save_conversation_state') as mock_save, \
+                patch('ask.modes.interactive.process_variables', side_effect=lambda text: (text, False)), \
+                patch.object(interactive_mode, 'stream_reply'):
+            result = interactive_mode.process_input(cmd)
         
-        # Test non-exit commands
-        assert interactive_mode._should_exit('help') is False
-        assert interactive_mode._should_exit('what is exit?') is False
+        assert result is not should_exit
+        assert mock_save.called is should_exit
     
-    def test_help_command(self, interactive_mode):
+    def test_help_command(self, capsys, interactive_mode):
         """Test help command display"""
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_help_command()
-            
-            # Verify help content is printed
-            calls = [str(call) for call in mock_print.call_args_list]
-            help_text = ' '.join(calls)
-            
-            assert 'Available commands:' in help_text
-            assert 'help' in help_text
-            assert 'exit' in help_text
-            assert 'upload' in help_text
+        interactive_mode.process_input("help")
+        
+        # Verify help content is printed
+        help_text = capsys.readouterr().out
+        
+        assert 'Available commands:' in help_text
+        assert 'help' in help_text
+        assert 'exit' in help_text
+        assert 'upload' in help_text
     
-    @patch('builtins.open', create=True)
-    def test_history_command(self, mock_open, interactive_mode):
+    def test_history_command(self, monkeypatch, tmp_path, capsys, interactive_mode):
         """Test history command"""
-        # Mock history file content
-        mock_open.return_value.__enter__.return_value.readlines.return_value = [
-            "query 1\n",
-            "query 2\n",
-            "query 3\n"
+        history_file = tmp_path / "history"
+        history_file.write_text("query 1\nquery 2\n\nquery 3\n")
+        monkeypatch.setattr('ask.modes.interactive.HISTORY_FILE', str(history_file))
+        
+        # Test showing all history; blank lines are skipped
+        interactive_mode.show_history()
+        assert capsys.readouterr().out.splitlines() == [
+            "1. query 1",
+            "2. query 2",
+            "3. query 3"
         ]
         
-        with patch('builtins.print') as mock_print:
-            # Test showing all history
-            interactive_mode.handle_history_command()
-            assert mock_print.call_count >= 3
-            
-            # Reset mock
-            mock_print.reset_mock()
-            
-            # Test showing last N entries
-            interactive_mode.handle_history_command(2)
-            assert mock_print.call_count >= 2
+        # Test showing last N entries
+        interactive_mode.show_history(2)
+        assert capsys.readouterr().out.splitlines() == ["1. query 2", "2. query 3"]
+    
+    def test_history_command_no_file(self, monkeypatch, tmp_path, capsys, interactive_mode):
+        """Test history command before anything has been entered"""
+        monkeypatch.setattr('ask.modes.interactive.HISTORY_FILE', str(tmp_path / "missing"))
+        
+        interactive_mode.show_history()
+        
+        assert "No history found" in capsys.readouterr().out
     
-    def test_conversation_command_empty(self, interactive_mode):
+    def test_conversation_command_empty(self, capsys, interactive_mode):
         """Test conversation command with no history"""
         interactive_mode.interactions = []
         
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_conversation_command()
-            
-            calls = [call[0][0] for call in mock_print.call_args_list]
-            assert any("No conversation" in str(call) for call in calls)
+        interactive_mode.show_conversation()
+        
+        assert "No conversation" in capsys.readouterr().out
     
-    def test_conversation_command_with_history(self, interactive_mode):
+    def test_conversation_command_with_history(self, capsys, interactive_mode):
         """Test conversation command with existing history"""
         interactive_mode.interactions = [
             Interaction(query="Hello", response="Hi there!"),
             Interaction(query="How are you?", response="I'm doing well!")
         ]
         
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_conversation_command()
-            
-            output = ' '.join(str(call) for call in mock_print.call_args_list)
-            assert "Hello" in output
-            assert "Hi there!" in output
-            assert "How are you?" in output
+        interactive_mode.show_conversation()
+        
+        output = capsys.readouterr().out
+        assert "Hello" in output
+        assert "Hi there!" in output
+        assert "How are you?" in output
     
-    def test_conversation_command_limit(self, interactive_mode):
+    def test_conversation_command_limit(self, capsys, interactive_mode):
         """Test conversation command with limit"""
         interactive_mode.interactions = [
             Interaction(query=f"Query {i}", response=f"Response {i}")
             for i in range(10)
         ]
         
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_conversation_command(3)
-            
-            output = ' '.join(str(call) for call in mock_print.call_args_list)
-            # Should show last 3 exchanges
-            assert "Query 9" in output
-            assert "Query 8" in output
-            assert "Query 7" in output
-            assert "Query 6" not in output
-    
-    def test_clear_command(self, interactive_mode):
+        interactive_mode.show_conversation(3)
+        
+        output = capsys.readouterr().out
+        # Should show last 3 exchanges
+        assert "Query 9" in output
+        assert "Query 8" in output
+        assert "Query 7" in output
+        assert "Query 6" not in output
+    
+    def test_clear_command(self, capsys, interactive_mode):
         """Test clear command"""
         interactive_mode.interactions = [
             Interaction(query="test", response="response")
         ]
         
-        with patch('ask.Modes.interactive.save_conversation_state') as mock_save:
-            with patch('builtins.print') as mock_print:
-                interactive_mode.handle_clear_command()
-                
-                assert len(interactive_mode.interactions) == 0
-                mock_save.assert_called_once_with([])
-                
-                output = ' '.join(str(call) for call in mock_print.call_args_list)
-                assert "cleared" in output.lower()
-    
-    @patch('ask.Modes.interactive.resolve_file_paths')
-    @patch('ask.Modes.interactive.prepare_files_for_upload')
-    def test_upload_command_single_file(self, mock_prepare, mock_resolve, interactive_mode):
-        """Test upload command with single file"""
-        mock_resolve.return_value = [Path("/test/file.txt")]
-        mock_prepare.return_value = (["file.txt content"], [])
-        
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_upload_command(["file.txt"])
+        with patch('ask.modes.interactive.save_conversation_state') as mock_save:
+            interactive_mode.clear_conversation()
             
-            mock_resolve.assert_called_once_with(["file.txt"], recursive=False)
-            mock_prepare.assert_called_once()
+            assert len(interactive_mode.interactions) == 0
+            mock_save.assert_called_once_with([])
             
-            output = ' '.join(str(call) for call in mock_print.call_args_list)
-            assert "uploaded" in output.lower()
+            assert "cleared" in capsys.readouterr().out.lower()
+    
+    @patch('ask.modes.interactive.resolve_file_paths')
+    @patch('ask.modes.interactive.prepare_files_for_upload_parallel')
+    def test_upload_command_single_file(self, mock_prepare, mock_resolve, capsys, interactive_mode):
+        """Test upload command with single file"""
+        mock_resolve.return_value = [Path("/test/image.png")]
+        mock_prepare.return_value = (
+            [{"file_name": "image.png", "size": 2048, "mime_type": "image/png"}],
+            ""
+        )
+        interactive_mode.client.upload_large_files.return_value = 0
+        
+        with patch('builtins.input', return_value=""):
+            with patch.object(interactive_mode, 'stream_reply') as mock_reply:
+                interactive_mode.handle_upload_command(["image.png"])
+        
+        mock_resolve.assert_called_once_with(["image.png"], allow_directories=False)
+        mock_prepare.assert_called_once()
+        mock_reply.assert_called_once_with("", mock_prepare.return_value[0], "")
+        
+        assert "ready to send 1 image files" in capsys.readouterr().out.lower()
     
-    @patch('ask.Modes.interactive.resolve_file_paths')
+    @patch('ask.modes.interactive.resolve_file_paths')
     def test_upload_command_recursive(self, mock_resolve, interactive_mode):
         """Test upload command with recursive flag"""
         mock_resolve.return_value = [
@@ -151,81 +168,106 @@ class TestInteractiveMode:
             Path("/test/dir/file2.txt")
         ]
         
-        with patch('ask.Modes.interactive.prepare_files_for_upload'):
+        with patch('ask.modes.interactive.prepare_files_for_upload_parallel', return_value=([], "")):
             interactive_mode.handle_upload_command(["--recursive", "/test/dir"])
             
-            mock_resolve.assert_called_with(["/test/dir"], recursive=True)
+            mock_resolve.assert_called_with(["/test/dir"], allow_directories=True)
     
-    def test_upload_command_no_files(self, interactive_mode):
+    def test_upload_command_no_files(self, capsys, interactive_mode):
         """Test upload command with no files specified"""
-        with patch('builtins.print') as mock_print:
-            interactive_mode.handle_upload_command([])
-            
-            output = ' '.join(str(call) for call in mock_print.call_args_list)
-            assert "usage" in output.lower()
+        interactive_mode.handle_upload_command([])
+        
+        assert "usage" in capsys.readouterr().out.lower()
     
-    @patch('ask.Modes.interactive.PromptSession')
-    def test_run_loop_exit(self, mock_prompt_session_class, interactive_mode):
+    def test_run_loop_exit(self, interactive_mode):
         """Test main run loop with exit command"""
-        mock_session = Mock()
-        mock_session.prompt.side_effect = ["test query", "exit"]
-        mock_prompt_session_class.return_value = mock_session
+        interactive_mode.session = Mock()
+        interactive_mode.session.prompt.side_effect = ["test query", "exit"]
+        interactive_mode.client.stream_response.side_effect = fake_stream("Response")
         
-        interactive_mode.client.generate_response.return_value = (
-            "Response", 
-            [Interaction(query="test query", response="Response")]
-        )
-        
-        with patch('builtins.print'):
+        with patch('ask.modes.interactive.process_variables', side_effect=lambda text: (text, False)), \
+                patch('ask.modes.interactive.journal_interaction'), \
+                patch('ask.modes.interactive.append_to_conversation_log'), \
+                patch('ask.modes.interactive.save_conversation_state') as mock_save:
             interactive_mode.run()
         
         # Should have prompted twice (once for query, once for exit)
-        assert mock_session.prompt.call_count == 2
-        assert interactive_mode.client.generate_response.call_count == 1
+        assert interactive_mode.session.prompt.call_count == 2
+        assert interactive_mode.client.stream_response.call_count == 1
+        # Exiting saves the conversation
+        mock_save.assert_called_once_with(interactive_mode.interactions)
+        # Leaving the loop releases the client's connection pool
+        interactive_mode.client.__exit__.assert_called_once()
     
-    @patch('ask.Modes.interactive.PromptSession')
-    def test_run_loop_keyboard_interrupt(self, mock_prompt_session_class, interactive_mode):
+    def test_run_loop_keyboard_interrupt(self, interactive_mode):
         """Test handling keyboard interrupt in run loop"""
-        mock_session = Mock()
-        mock_session.prompt.side_effect = KeyboardInterrupt()
-        mock_prompt_session_class.return_value = mock_session
+        interactive_mode.session = Mock()
+        interactive_mode.session.prompt.side_effect = KeyboardInterrupt()
         
-        with patch('builtins.print') as mock_print:
+        with patch('ask.modes.interactive.save_conversation_state') as mock_save:
             interactive_mode.run()
-            
-            # Should exit gracefully
-            output = ' '.join(str(call) for call in mock_print.call_args_list)
-            assert "goodbye" in output.lower() or "exit" in output.lower()
+        
+        # Should save and exit gracefully
+        mock_save.assert_called_once()
     
-    def test_process_query_normal(self, interactive_mode):
+    def test_process_query_normal(self, capsys, interactive_mode):
         """Test processing a normal query"""
         query = "What is Python?"
-        interactive_mode.client.generate_response.return_value = (
-            "Python is a programming language",
-            [Interaction(query=query, response="Python is a programming language")]
+        interactive_mode.client.stream_response.side_effect = fake_stream(
+            "Python is ", "a programming language"
         )
         
-        with patch('ask.Modes.interactive.save_conversation_state'):
-            with patch('ask.Modes.interactive.append_to_conversation_log'):
-                with patch('builtins.print'):
-                    result = interactive_mode._process_query(query)
+        with patch('ask.modes.interactive.process_variables', side_effect=lambda text: (text, False)), \
+                patch('ask.modes.interactive.journal_interaction') as mock_journal, \
+                patch('ask.modes.interactive.append_to_conversation_log'):
+            result = interactive_mode.process_input(query)
         
         assert result is True  # Should continue
         assert len(interactive_mode.interactions) == 1
         assert interactive_mode.interactions[0].query == query
+        mock_journal.assert_called_once_with(interactive_mode.interactions[0])
+        assert "Python is a programming language" in capsys.readouterr().out
+    
+    def test_reply_rendered_when_complete(self, interactive_mode):
+        """Test that by default the whole response goes through print_response"""
+        interactive_mode.client.stream_response.side_effect = fake_stream("**bold** ", "text")
+        
+        with patch('ask.modes.interactive.print_response') as mock_print, \
+                patch.object(interactive_mode, 'record_interaction'):
+            result = interactive_mode.stream_reply("query")
+        
+        assert result == "**bold** text"
+        mock_print.assert_called_once()
+        assert mock_print.call_args.args[1] == "**bold** text"
+    
+    def test_reply_streamed_when_enabled(self, capsys, interactive_mode):
+        """Test that stream_responses writes chunks as they arrive instead"""
+        interactive_mode.stream_responses = True
+        interactive_mode.client.stream_response.side_effect = fake_stream("**bold** ", "text")
+        
+        with patch('ask.modes.interactive.print_response') as mock_print, \
+                patch.object(interactive_mode, 'record_interaction') as mock_record:
+            result = interactive_mode.stream_reply("query")
+        
+        assert result == "**bold** text"
+        mock_print.assert_not_called()
+        assert "**bold** text" in capsys.readouterr().out
+        mock_record.assert_called_once_with(interactive_mode.interactions[-1])
     
-    def test_process_query_commands(self, interactive_mode):
+    def test_process_query_commands(self, capsys, interactive_mode):
         """Test processing various commands"""
         # Test help command
-        with patch.object(interactive_mode, 'handle_help_command') as mock_help:
-            interactive_mode._process_query("help")
-            mock_help.assert_called_once()
+        assert interactive_mode.process_input("help") is True
+        assert "Available commands:" in capsys.readouterr().out
         
         # Test clear command
-        with patch.object(interactive_mode, 'handle_clear_command') as mock_clear:
-            interactive_mode._process_query("clear")
-            mock_clear.assert_called_once()
+        interactive_mode.interactions = [Interaction(query="q", response="r")]
+        with patch('ask.modes.interactive.save_conversation_state') as mock_save:
+            assert interactive_mode.process_input("clear") is True
+            mock_save.assert_called_once_with([])
+        assert interactive_mode.interactions == []
         
         # Test exit command
-        result = interactive_mode._process_query("exit")
-        assert result is False  # Should exit
\ No newline at end of file
+        with patch('ask.modes.interactive.save_conversation_state'):
+            result = interactive_mode.process_input("exit")
+        assert result is False  # Should exit
@@ -0,0 +1,77 @@
+"""Unit tests for the plugin decorators"""
+
+import pytest
+from ask.plugins.base import PluginPriority, PluginType
+from ask.plugins.decorators import (
+    command_plugin,
+    filter_plugin,
+    formatter_plugin,
+    plugin_hook,
+    postprocessor_plugin,
+    preprocessor_plugin,
+)
+
+
+def greet(name, punctuation="!"):
+    """Say hello"""
+    return f"Hello, {name}{punctuation}"
+
+
+class TestPluginDecorators:
+    """Test that the decorators tag the function itself rather than wrapping it"""
+
+    @pytest.mark.parametrize("decorator, plugin_type, flag", [
+        (command_plugin("greet", description="Greets"), PluginType.COMMAND, "_is_command_plugin"),
+        (filter_plugin("greet", description="Greets"), PluginType.FILTER, "_is_filter_plugin"),
+        (formatter_plugin("greet", "text", description="Greets"), PluginType.FORMATTER, "_is_formatter_plugin"),
+        (preprocessor_plugin("greet", description="Greets"), PluginType.PREPROCESSOR, "_is_preprocessor_plugin"),
+        (postprocessor_plugin("greet", description="Greets"), PluginType.POSTPROCESSOR, "_is_postprocessor_plugin")
+    ], ids=["command", "filter", "formatter", "preprocessor", "postprocessor"])
+    def test_plugin_metadata(self, decorator, plugin_type, flag):
+        """Test that the function keeps its identity and gains plugin metadata"""
+        def func(name, punctuation="!"):
+            return greet(name, punctuation)
+
+        decorated = decorator(func)
+
+        assert decorated is func
+        assert decorated.__name__ == "func"
+        assert decorated("Ada", punctuation="?") == "Hello, Ada?"
+        assert getattr(decorated, flag) is True
+        metadata = decorated._plugin_metadata
+        assert metadata.name == "greet"
+        assert metadata.description == "Greets"
+        assert metadata.plugin_type == plugin_type
+        assert metadata.priority == PluginPriority.NORMAL
+
+    def test_command_plugin_attributes(self):
+        """Test the command name and help text, falling back to the description"""
+        described = command_plugin("hello", description="Says hello")(lambda: None)
+        helped = command_plugin("hello", description="Says hello", help_text="hello NAME")(lambda: None)
+
+        assert described._command_name == "hello"
+        assert described._command_help == "Says hello"
+        assert helped._command_help == "hello NAME"
+
+    def test_filter_and_formatter_attributes(self):
+        """Test the filter type and format name"""
+        filtered = filter_plugin("upper", filter_type="output")(lambda text: text.upper())
+        formatted = formatter_plugin("md", "markdown")(lambda text: text.strip())
+
+        assert filtered._filter_type == "output"
+        assert filtered("hi") == "HI"
+        assert formatted._format_name == "markdown"
+
+    def test_plugin_hook(self):
+        """Test that a hook keeps its identity, docstring and priority"""
+        def hook(name):
+            """Run before each query"""
+            return greet(name)
+
+        decorated = plugin_hook("before_query", priority=PluginPriority.HIGH)(hook)
+
+        assert decorated is hook
+        assert decorated.__doc__ == "Run before each query"
+        assert decorated("Ada") == "Hello, Ada!"
+        assert decorated._plugin_hook == "before_query"
+        assert decorated._plugin_priority == PluginPriority.HIGH
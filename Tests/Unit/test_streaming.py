@@ -0,0 +1,166 @@
+"""Unit tests for SSE stream parsing"""
+
+import itertools
+import random
+import pytest
+from unittest.mock import Mock
+from ask.utils.streaming import SSEProcessor, StreamEventType
+
+# Each event as its SSE lines, without line terminators
+SSE_EVENTS = [
+    [": keep-alive", "event: message_start", 'data: {"type": "message_start"}'],
+    ["event: content_block_delta", 'data: {"text": "café ✓"}'],
+    ["data: line one", "data: line two"]
+]
+
+EXPECTED_DATA = [
+    '{"type": "message_start"}',
+    '{"text": "café ✓"}',
+    "line one\nline two"
+]
+
+
+def sse_stream(*line_endings):
+    """Encode SSE_EVENTS, cycling through line_endings from one event to the next"""
+    return "".join(
+        "".join(line + ending for line in lines) + ending
+        for lines, ending in zip(SSE_EVENTS, itertools.cycle(line_endings))
+    ).encode("utf-8")
+
+
+def split_whole(data):
+    """Deliver the stream in a single chunk"""
+    return [data]
+
+
+def split_bytes(data):
+    """Deliver the stream one byte per chunk"""
+    return [data[i:i + 1] for i in range(len(data))]
+
+
+def split_random(seed):
+    """Build a splitter that cuts the stream at seeded random offsets"""
+    def split(data):
+        rng = random.Random(seed)
+        cuts = sorted(rng.sample(range(1, len(data)), 12))
+        return [data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])]
+    return split
+
+
+def mock_response(chunks):
+    """Build a response whose body arrives as the given chunks"""
+    async def iter_any():
+        for chunk in chunks:
+            yield chunk
+
+    response = Mock(status=200, headers={})
+    response.content.iter_any = iter_any
+    return response
+
+
+async def parse(processor, chunks):
+    """Run a stream through process_stream and return its CHUNK payloads"""
+    return [
+        event.data
+        async for event in processor.process_stream(mock_response(chunks))
+        if event.event_type == StreamEventType.CHUNK
+    ]
+
+
+SPLITTERS = pytest.mark.parametrize("split", [
+    split_whole,
+    split_bytes,
+    *(split_random(seed) for seed in range(5))
+], ids=["whole", "byte_by_byte", *(f"random_{seed}" for seed in range(5))])
+
+LINE_ENDINGS = pytest.mark.parametrize("line_ending", ["\n", "\r\n"], ids=["lf", "crlf"])
+
+
+class TestSSEProcessor:
+    """Test cases for SSE parsing across arbitrary chunk boundaries"""
+
+    @SPLITTERS
+    @LINE_ENDINGS
+    async def test_events_independent_of_chunking(self, split, line_ending):
+        """Test that every way of splitting the stream yields the same events"""
+        chunks = split(sse_stream(line_ending))
+
+        assert await parse(SSEProcessor(), chunks) == EXPECTED_DATA
+
+    @SPLITTERS
+    async def test_mixed_line_endings(self, split):
+        """Test a stream that switches between CRLF and LF"""
+        stream = sse_stream("\r\n", "\n")
+
+        assert await parse(SSEProcessor(), split(stream)) == EXPECTED_DATA
+
+    @LINE_ENDINGS
+    async def test_content_is_parsed_payloads(self, line_ending):
+        """Test that get_content returns the payloads, not the SSE framing"""
+        processor = SSEProcessor()
+        await parse(processor, [sse_stream(line_ending)])
+
+        assert processor.get_content() == "\n".join(EXPECTED_DATA)
+
+    async def test_raw_buffer_keeps_framing(self):
+        """Test that raw_buffer keeps the stream exactly as received"""
+        stream = sse_stream("\r\n")
+        processor = SSEProcessor(raw_buffer=True)
+        await parse(processor, split_bytes(stream))
+
+        assert processor.get_content() == stream.decode("utf-8")
+
+
+ANTHROPIC_STREAM = (
+    b"event: message_start\r\n"
+    b'data: {"type": "message_start"}\r\n'
+    b"\r\n"
+    b"event: content_block_delta\r\n"
+    b'data: {"type": "content_block_delta", "delta": {"text": "Hello, "}}\r\n'
+    b"\r\n"
+    b"event: content_block_delta\r\n"
+    b'data: {"type": "content_block_delta", "delta": {"text": "w\xc3\xb6rld"}}\r\n'
+    b"\r\n"
+    b"event: message_stop\r\n"
+    b'data: {"type": "message_stop"}\r\n'
+    b"\r\n"
+)
+
+
+class TestCollectJsonDeltas:
+    """Test cases for extracting Anthropic text deltas from an SSE stream"""
+
+    @SPLITTERS
+    async def test_collects_deltas(self, split):
+        """Test that deltas are collected and reported however the stream is split"""
+        on_text = Mock()
+
+        text = await SSEProcessor().collect_json_deltas(
+            mock_response(split(ANTHROPIC_STREAM)), on_text
+        )
+
+        assert text == "Hello, wörld"
+        assert [c.args[0] for c in on_text.call_args_list] == ["Hello, ", "wörld"]
+
+    async def test_non_json_data_passed_through(self):
+        """Test that non-JSON data reaches on_text but not the result"""
+        on_text = Mock()
+        stream = b"data: [DONE]\n\n" + ANTHROPIC_STREAM
+
+        text = await SSEProcessor().collect_json_deltas(mock_response([stream]), on_text)
+
+        assert text == "Hello, wörld"
+        on_text.assert_any_call("[DONE]")
+
+    @pytest.mark.parametrize("ending", [b"\n", b""], ids=["no_blank_line", "no_newline"])
+    async def test_unterminated_last_event_flushed(self, ending):
+        """Test that a last event cut off before its blank line is still processed"""
+        stream = (
+            ANTHROPIC_STREAM
+            + b'data: {"type": "content_block_delta", "delta": {"text": "!"}}'
+            + ending
+        )
+
+        text = await SSEProcessor().collect_json_deltas(mock_response(split_bytes(stream)))
+
+        assert text == "Hello, wörld!"
@@ -3,7 +3,6 @@ Tests for validation utilities
 """
 
 import pytest
-import tempfile
 from pathlib import Path
 from ask.utils.validation import (
     validate_input_length,
@@ -49,68 +48,40 @@ class TestInputValidation:
 class TestFileValidation:
     """Test file validation functions."""
     
-    def test_validate_file_path_valid(self):
+    def test_validate_file_path_valid(self, tmp_path):
         """Test file path validation with valid file."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(b"test content")
-            tmp_path = Path(tmp.name)
+        path = tmp_path / "test.txt"
+        path.write_bytes(b"test content")
         
-        try:
-            result = validate_file_path(tmp_path)
-            assert result == tmp_path.resolve()
-        finally:
-            tmp_path.unlink()
+        result = validate_file_path(path)
+        assert result == path.resolve()
     
     def test_validate_file_path_not_exists(self):
         """Test file path validation with non-existent file."""
         with pytest.raises(FileError, match="File not found"):
             validate_file_path("/nonexistent/file.txt")
     
+    # validate_file_type only inspects the name, so no file is created
     def test_validate_file_type_valid(self):
         """Test file type validation with allowed type."""
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-        
-        try:
-            result = validate_file_type(tmp_path, allowed_types=[".txt", ".md"])
-            assert result is True
-        finally:
-            tmp_path.unlink()
+        result = validate_file_type(Path("notes.txt"), allowed_types=[".txt", ".md"])
+        assert result is True
     
     def test_validate_file_type_invalid(self):
         """Test file type validation with disallowed type."""
-        with tempfile.NamedTemporaryFile(suffix=".exe", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-        
-        try:
-            with pytest.raises(ValidationError, match="File type not allowed"):
-                validate_file_type(tmp_path, allowed_types=[".txt", ".md"])
-        finally:
-            tmp_path.unlink()
-    
-    def test_validate_file_size_valid(self):
-        """Test file size validation with valid size."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(b"small content")
-            tmp_path = Path(tmp.name)
+        with pytest.raises(ValidationError, match="File type not allowed"):
+            validate_file_type(Path("setup.exe"), allowed_types=[".txt", ".md"])
+    
+    def test_validate_file_size(self, tmp_path):
+        """Test file size validation below and above the limit."""
+        small = tmp_path / "small.txt"
+        small.write_bytes(b"small content")
+        large = tmp_path / "large.txt"
+        large.write_bytes(b"x" * 1000)
         
-        try:
-            result = validate_file_size(tmp_path, max_size=1000)
-            assert result > 0
-        finally:
-            tmp_path.unlink()
-    
-    def test_validate_file_size_too_large(self):
-        """Test file size validation with too large file."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(b"x" * 1000)
-            tmp_path = Path(tmp.name)
-        
-        try:
-            with pytest.raises(ValidationError, match="File too large"):
-                validate_file_size(tmp_path, max_size=100)
-        finally:
-            tmp_path.unlink()
+        assert validate_file_size(small, max_size=1000) == len(b"small content")
+        with pytest.raises(ValidationError, match="File too large"):
+            validate_file_size(large, max_size=100)
 
 
 class TestURLValidation:
@@ -188,16 +159,14 @@ class TestCommandValidation:
         with pytest.raises(ValidationError, match="Command cannot be empty"):
             validate_command_input("   \n\t   ")
     
-    def test_validate_command_input_dangerous_pattern(self):
+    @pytest.mark.parametrize("cmd", [
+        "help; rm -rf /",
+        "help && rm file.txt",
+        "help | rm file.txt",
+        "help `rm file.txt`",
+        "help $(rm file.txt)"
+    ])
+    def test_validate_command_input_dangerous_pattern(self, cmd):
         """Test command validation with dangerous patterns."""
-        dangerous_commands = [
-            "help; rm -rf /",
-            "help && rm file.txt",
-            "help | rm file.txt",
-            "help `rm file.txt`",
-            "help $(rm file.txt)"
-        ]
-        
-        for cmd in dangerous_commands:
-            with pytest.raises(ValidationError, match="potentially dangerous patterns"):
-                validate_command_input(cmd)
\ No newline at end of file
+        with pytest.raises(ValidationError, match="potentially dangerous patterns"):
+            validate_command_input(cmd)
\ No newline at end of file
@@ -27,6 +27,8 @@ class TestVariableManager(unittest.TestCase):
     
     def tearDown(self):
         """Clean up temporary file after each test"""
+        # Write any pending save now so its timer can't recreate the file
+        self.vm.flush()
         if os.path.exists(self.temp_path):
             os.unlink(self.temp_path)
     
@@ -577,6 +579,7 @@ class TestVariableManager(unittest.TestCase):
         self.assertEqual(vm2.get_variable("unicode"), 'αβγδε')
         
         # Cleanup
+        vm.flush()
         Path(temp_file).unlink(missing_ok=True)
     
     def test_70_clear_with_persistence(self):
@@ -596,6 +599,7 @@ class TestVariableManager(unittest.TestCase):
         self.assertEqual(len(vm2.list_variables()), 0)
         
         # Cleanup
+        vm.flush()
         Path(temp_file).unlink(missing_ok=True)
     
     def test_71_assignment_with_trailing_spaces(self):
@@ -681,6 +685,17 @@ class TestVariableManager(unittest.TestCase):
         # Should not interpolate inside JSON
         self.assertEqual(value["greeting"], "Hello name")
 
+    def test_81_reload_after_external_change(self):
+        """Test that a change written by another manager is picked up"""
+        self.vm.set_variable("shared", "old")
+        self.vm.flush()
+
+        other = VariableManager(self.temp_path)
+        other.set_variable("shared", "new value")
+        other.flush()
+
+        self.assertEqual(self.vm.get_variable("shared"), "new value")
+
 
 if __name__ == '__main__':
     # Run all tests
@@ -4,7 +4,7 @@ import pytest
 import tempfile
 import shutil
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, MagicMock, create_autospec
 import asyncio
 import json
 from typing import Dict, Any, List
@@ -49,6 +49,20 @@ def mock_claude_client():
     return client
 
 
+@pytest.fixture
+def claude_client_mock():
+    """Autospec'd mock of the synchronous ClaudeClient
+
+    Unlike mock_claude_client, calls are checked against ClaudeClient's
+    real signatures. Using it as a context manager yields the mock itself,
+    as the real client does.
+    """
+    from ask.api.client import ClaudeClient
+    client = create_autospec(ClaudeClient, instance=True)
+    client.__enter__.return_value = client
+    return client
+
+
 @pytest.fixture
 def cli_runner():
     """Create a CLI test runner"""
@@ -96,6 +110,25 @@ def mock_response_data():
     }
 
 
+@pytest.fixture
+def mock_anthropic(monkeypatch, mock_response_data):
+    """Replace the Anthropic SDK client that ClaudeClient wraps
+
+    ClaudeClient builds anthropic.Anthropic() when it is created, so this
+    patches the class and returns the SDK instance every ClaudeClient gets.
+    messages.create returns the mock_response_data text, and
+    messages.stream yields it as a single chunk. Tests change
+    ``messages.create.return_value`` or set a ``side_effect`` when they
+    need something else.
+    """
+    sdk = MagicMock()
+    text = mock_response_data["content"][0]["text"]
+    sdk.messages.create.return_value = Mock(content=[Mock(type="text", text=text)])
+    sdk.messages.stream.return_value.__enter__.return_value.text_stream = [text]
+    monkeypatch.setattr("anthropic.Anthropic", Mock(return_value=sdk))
+    return sdk
+
+
 @pytest.fixture
 def test_files(tmp_path):
     """Create test files for upload testing"""
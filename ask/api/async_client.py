@@ -23,7 +23,7 @@ class AsyncClaudeClient:
     ):
         self.model = model
         self.max_tokens = max_tokens
-        self.api_key = api_key or get_api_key()
+        self.api_key = api_key or get_api_key()  # also builds self._headers
         self.base_url = "https://api.anthropic.com/v1/messages"
         self.session: Optional[aiohttp.ClientSession] = None
 
@@ -37,14 +37,25 @@ class AsyncClaudeClient:
         if self.session:
             await self.session.close()
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers"""
-        return {
+    @property
+    def api_key(self) -> str:
+        """API key sent with every request"""
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value: str) -> None:
+        # The headers only depend on the key, so build them once per key
+        self._api_key = value
+        self._headers = {
             "anthropic-version": "2023-06-01",
-            "x-api-key": self.api_key,
+            "x-api-key": value,
             "content-type": "application/json",
         }
 
+    def _get_headers(self) -> Dict[str, str]:
+        """Get request headers (shared between requests; do not modify)"""
+        return self._headers
+
     def _build_messages(
         self, query: str, interactions: Optional[List[Interaction]] = None
     ) -> List[Dict[str, str]]:
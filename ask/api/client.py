@@ -2,9 +2,16 @@
 Anthropic API client wrapper with improved text file handling
 """
 
-from anthropic import Anthropic
+from concurrent.futures import ThreadPoolExecutor
 
-from ..constants import DEFAULT_MAX_TOKENS, DEFAULT_MODEL, DEFAULT_SYSTEM_PROMPT
+from ..constants import (
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_MODEL,
+    DEFAULT_SYSTEM_PROMPT,
+    FILES_API_BETA,
+    UPLOAD_DIRECT_MAX_WORKERS,
+    UPLOAD_DIRECT_THRESHOLD,
+)
 from ..models import Interaction
 from ..utils.io import format_file_for_upload, read_token
 
@@ -14,10 +21,155 @@ class ClaudeClient:
 
     def __init__(self, api_key=None, model=DEFAULT_MODEL):
         """Initialize the Claude client"""
+        # Deferred: the SDK is by far the slowest import in the package
+        from anthropic import Anthropic
+
         self.api_key = api_key or read_token()
+        # One SDK client per ClaudeClient: it owns a pooled HTTP session, so
+        # later requests reuse the open connection instead of a new handshake
         self.client = Anthropic(api_key=self.api_key)
         self.model = model
 
+    def close(self):
+        """Closes the underlying HTTP connection pool"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def upload_large_files(
+        self,
+        files,
+        threshold=UPLOAD_DIRECT_THRESHOLD,
+        max_workers=UPLOAD_DIRECT_MAX_WORKERS,
+    ):
+        """
+        Uploads large image files through the Files API.
+
+        Each uploaded file gets a "file_id" so the message only carries a
+        reference to it instead of the base64-encoded bytes. Files below the
+        threshold, or whose upload fails, are sent inline as before.
+
+        Args:
+            files (list): File objects from prepare_files_for_upload
+            threshold (int): Minimum size in bytes for a direct upload
+            max_workers (int): Maximum number of concurrent uploads
+
+        Returns:
+            int: Number of files uploaded
+        """
+        large_files = [
+            file_obj
+            for file_obj in files
+            if file_obj["size"] > threshold and "file_id" not in file_obj
+        ]
+        if not large_files:
+            return 0
+
+        def upload(file_obj):
+            try:
+                with open(file_obj["file_path"], "rb") as f:
+                    metadata = self.client.beta.files.upload(
+                        file=(file_obj["file_name"], f, file_obj["mime_type"]),
+                        betas=[FILES_API_BETA],
+                    )
+            except Exception:
+                return False
+            file_obj["file_id"] = metadata.id
+            return True
+
+        workers = min(max_workers, len(large_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(upload, large_files))
+
+    def delete_uploaded_files(self, files, max_workers=UPLOAD_DIRECT_MAX_WORKERS):
+        """
+        Deletes files previously sent through upload_large_files.
+
+        Like the uploads, the deletions run concurrently so several files
+        cost about one round trip instead of one each.
+
+        Args:
+            files (list): File objects, some of which may carry a "file_id"
+            max_workers (int): Maximum number of concurrent deletions
+        """
+        file_ids = [
+            file_id
+            for file_id in (file_obj.pop("file_id", None) for file_obj in files)
+            if file_id is not None
+        ]
+        if not file_ids:
+            return
+
+        def delete(file_id):
+            try:
+                self.client.beta.files.delete(file_id, betas=[FILES_API_BETA])
+            except Exception:
+                # The file expires server-side eventually; nothing else to do
+                pass
+
+        workers = min(max_workers, len(file_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(delete, file_ids))
+
+    def _messages_api(self, files):
+        """
+        Selects the messages endpoint for a request.
+
+        Returns:
+            tuple: (messages resource, extra keyword arguments)
+        """
+        if files and any("file_id" in file_obj for file_obj in files):
+            return self.client.beta.messages, {"betas": [FILES_API_BETA]}
+        return self.client.messages, {}
+
+    def _build_messages(self, prompt, interactions, files, text_files_content):
+        """
+        Builds the messages array and the history entry for a request.
+
+        Args:
+            prompt (str): The user's input prompt
+            interactions (list[Interaction]): Previous interactions
+            files (list): List of file objects to include
+            text_files_content (str): Content of text files to include in the message
+
+        Returns:
+            tuple: (messages, query_for_history)
+        """
+        # Combine text files content with the prompt if present
+        combined_prompt = prompt
+        if text_files_content:
+            combined_prompt = f"{prompt}\n\n{text_files_content}"
+
+        # Build the messages array from interactions
+        messages = []
+        for interaction in interactions:
+            messages.append({"role": "user", "content": interaction.query})
+            messages.append({"role": "assistant", "content": interaction.response})
+
+        if not files:
+            # For text-only messages, use the simple format
+            messages.append({"role": "user", "content": combined_prompt})
+            return messages, combined_prompt
+
+        # For messages with files, we need to use the structured format
+        user_message = {"role": "user", "content": []}
+        user_message["content"].append({"type": "text", "text": combined_prompt})
+        for file_obj in files:
+            user_message["content"].append(format_file_for_upload(file_obj))
+        messages.append(user_message)
+
+        # Store a simplified version of file messages in history
+        file_list = ", ".join(file_obj["file_name"] for file_obj in files)
+        if text_files_content:
+            query_for_history = f"{prompt}\n[Files: {file_list} and text files]"
+        else:
+            query_for_history = f"{prompt}\n[Files: {file_list}]"
+        return messages, query_for_history
+
     def generate_response(
         self,
         prompt,
@@ -44,58 +196,22 @@ class ClaudeClient:
         if interactions is None:
             interactions = []
 
-        # Combine text files content with the prompt if present
-        combined_prompt = prompt
-        if text_files_content:
-            combined_prompt = f"{prompt}\n\n{text_files_content}"
-
-        # Prepare the user message with files if provided
-        user_message = {"role": "user", "content": []}
-
-        # Add text content
-        user_message["content"].append({"type": "text", "text": combined_prompt})
-
-        # Add image files if provided
-        if files and len(files) > 0:
-            for file_obj in files:
-                file_content = format_file_for_upload(file_obj)
-                user_message["content"].append(file_content)
-
-        # Build the messages array from interactions
-        messages = []
-        for interaction in interactions:
-            messages.append({"role": "user", "content": interaction.query})
-            messages.append({"role": "assistant", "content": interaction.response})
+        messages, query_for_history = self._build_messages(
+            prompt, interactions, files, text_files_content
+        )
 
-        # Add the new user message
-        if files and len(files) > 0:
-            # For messages with files, we need to use the structured format
-            messages.append(user_message)
-        else:
-            # For text-only messages, use the simple format
-            messages.append({"role": "user", "content": combined_prompt})
+        messages_api, extra = self._messages_api(files)
 
         try:
-            response = self.client.messages.create(
+            response = messages_api.create(
                 model=self.model,
                 system=system_prompt,
                 messages=messages,
                 max_tokens=max_tokens,
+                **extra,
             )
             current_response = response.content[0].text
 
-            # Create the query string for the interaction
-            if files and len(files) > 0:
-                # For messages with files, store a simplified version in history
-                file_names = [file_obj["file_name"] for file_obj in files]
-                file_list = ", ".join(file_names)
-                if text_files_content:
-                    query_for_history = f"{prompt}\n[Files: {file_list} and text files]"
-                else:
-                    query_for_history = f"{prompt}\n[Files: {file_list}]"
-            else:
-                query_for_history = combined_prompt
-
             # Create new interaction and add to history
             new_interaction = Interaction(query_for_history, current_response)
             interactions.append(new_interaction)
@@ -103,3 +219,57 @@ class ClaudeClient:
             return current_response, interactions
         except Exception as e:
             return f"Error while generating response: {e}", interactions
+
+    def stream_response(
+        self,
+        prompt,
+        system_prompt=DEFAULT_SYSTEM_PROMPT,
+        interactions=None,
+        files=None,
+        text_files_content=None,
+        max_tokens=DEFAULT_MAX_TOKENS,
+    ):
+        """
+        Streams a response from Claude, yielding text deltas as they arrive.
+
+        Once the stream completes the full response is appended to
+        ``interactions`` as a new Interaction, just like generate_response.
+        On failure the error message is yielded and history is left untouched.
+
+        Args:
+            prompt (str): The user's input prompt
+            system_prompt (str): System prompt for Claude
+            interactions (list[Interaction]): Previous interactions, updated in place
+            files (list): List of file objects to include
+            text_files_content (str): Content of text files to include in the message
+            max_tokens (int): Maximum tokens in response
+
+        Yields:
+            str: Chunks of response text
+        """
+        if interactions is None:
+            interactions = []
+
+        messages, query_for_history = self._build_messages(
+            prompt, interactions, files, text_files_content
+        )
+
+        messages_api, extra = self._messages_api(files)
+
+        parts = []
+        try:
+            with messages_api.stream(
+                model=self.model,
+                system=system_prompt,
+                messages=messages,
+                max_tokens=max_tokens,
+                **extra,
+            ) as stream:
+                for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            yield f"Error while generating response: {e}"
+            return
+
+        interactions.append(Interaction(query_for_history, "".join(parts)))
@@ -28,6 +28,10 @@ from .utils.output_formatter import (
 )
 from .utils.spinner import Spinner
 
+# One-shot command aliases
+_CONVERSATION_CMDS = frozenset({"c", "conversation"})
+_HELP_CMDS = frozenset({"help", "?"})
+
 
 def handle_command_line_query(
     query: str,
@@ -43,8 +47,6 @@ def handle_command_line_query(
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    client = ClaudeClient()
-
     # Add command to history
     with open(os.path.expanduser(HISTORY_FILE), "a") as f:
         f.write(query + "\n")
@@ -53,12 +55,13 @@ def handle_command_line_query(
     interactions = load_conversation_state()
 
     # Check for special commands
-    if query.lower() == "clear":
+    command = query.casefold()
+    if command == "clear":
         interactions = []
         save_conversation_state(interactions)
         print("Conversation history cleared.")
         return 0
-    if query.lower() == "c" or query.lower() == "conversation":
+    if command in _CONVERSATION_CMDS:
         if not interactions:
             print("No conversation history found.")
             return 0
@@ -80,14 +83,15 @@ def handle_command_line_query(
         return 0
 
     # Handle the upload command
-    if query.lower().startswith("upload "):
+    if command.startswith("upload "):
         args = query.split()[1:]
         interactive = InteractiveMode()
-        interactive.handle_upload_command(args)
+        with interactive.client:
+            interactive.handle_upload_command(args)
         return 0
 
     # Handle help command
-    if query.lower() in ["help", "?"]:
+    if command in _HELP_CMDS:
         print("Ask CLI - Command Line Interface for Claude AI")
         print("\nUsage:")
         print("  ask [command or query]")
@@ -111,79 +115,80 @@ def handle_command_line_query(
         print("\nWith no arguments, Ask CLI enters interactive mode.")
         return 0
 
-    # Configure client with model if specified
-    if model:
-        client.model = model
-
-    spinner = Spinner()
-    try:
-        if not no_spinner:
-            spinner.start()
-        reply, updated_interactions = client.generate_response(
-            query, interactions=interactions
-        )
-        if not no_spinner:
-            spinner.stop()
+    with ClaudeClient() as client:
+        # Configure client with model if specified
+        if model:
+            client.model = model
 
-        # Play context-aware music after generating response
+        spinner = Spinner()
         try:
-            from .utils.music import MusicPlayer
-
-            if MusicPlayer.is_enabled():
-                MusicPlayer.play_progression(
-                    input_text=query, output_text=f"SUCCESS: {reply[:100]}"
-                )
-        except:
-            pass
-
-        if json_output:
-            import json
-
-            output = {
-                "query": query,
-                "response": reply,
-                "model": getattr(client, "model", "default"),
-            }
-            print(json.dumps(output, indent=2))
-        else:
-            intro = random.choice(RESPONSE_INTROS)
-            print_response(intro, reply)
+            if not no_spinner:
+                spinner.start()
+            reply, updated_interactions = client.generate_response(
+                query, interactions=interactions
+            )
+            if not no_spinner:
+                spinner.stop()
 
-        # Generate MIDI from query and response
-        try:
-            from .utils.midi_music import MidiMusicGenerator
+            # Play context-aware music after generating response
+            try:
+                from .utils.music import MusicPlayer
 
-            MidiMusicGenerator.generate_and_save(query, reply)
-        except Exception:
-            # Don't fail if MIDI generation fails
-            pass
+                if MusicPlayer.is_enabled():
+                    MusicPlayer.play_progression(
+                        input_text=query, output_text=f"SUCCESS: {reply[:100]}"
+                    )
+            except:
+                pass
+
+            if json_output:
+                import json
+
+                output = {
+                    "query": query,
+                    "response": reply,
+                    "model": getattr(client, "model", "default"),
+                }
+                print(json.dumps(output, indent=2))
+            else:
+                intro = random.choice(RESPONSE_INTROS)
+                print_response(intro, reply)
 
-        # Save updated conversation state
-        save_conversation_state(updated_interactions)
-        # Log the latest interaction to markdown file
-        if updated_interactions:
-            append_to_conversation_log(updated_interactions[-1])
-        return 0
+            # Generate MIDI from query and response
+            try:
+                from .utils.midi_music import MidiMusicGenerator
+
+                MidiMusicGenerator.generate_and_save(query, reply)
+            except Exception:
+                # Don't fail if MIDI generation fails
+                pass
+
+            # Save updated conversation state
+            save_conversation_state(updated_interactions)
+            # Log the latest interaction to markdown file
+            if updated_interactions:
+                append_to_conversation_log(updated_interactions[-1])
+            return 0
 
-    except (KeyboardInterrupt, EOFError):
-        spinner.stop()
-        print("\nOperation canceled.")
-        return 1
-    except Exception as e:
-        spinner.stop()
-        error_msg = f"An error occurred while processing your request: {str(e)}"
-        print_error(error_msg)
+        except (KeyboardInterrupt, EOFError):
+            spinner.stop()
+            print("\nOperation canceled.")
+            return 1
+        except Exception as e:
+            spinner.stop()
+            error_msg = f"An error occurred while processing your request: {str(e)}"
+            print_error(error_msg)
 
-        # Play context-aware music for error
-        try:
-            from .utils.music import MusicPlayer
+            # Play context-aware music for error
+            try:
+                from .utils.music import MusicPlayer
 
-            if MusicPlayer.is_enabled():
-                MusicPlayer.play_progression(input_text=query, output_text="error")
-        except:
-            pass
+                if MusicPlayer.is_enabled():
+                    MusicPlayer.play_progression(input_text=query, output_text="error")
+            except:
+                pass
 
-        return 1
+            return 1
 
 
 def main():
@@ -11,8 +11,10 @@ import os
 HISTORY_FILE = os.path.expanduser("~/.ask_history")
 CONVERSATION_STATE_FILE = os.path.expanduser("~/.ask_conversation_state.json")
 CONVERSATION_LOG_FILE = os.path.expanduser("~/.ask_conversation.md")
+CONVERSATION_LOG_ARCHIVE_DIR = os.path.expanduser("~/.ask_conversation_archive")
 UPLOAD_CACHE_DIR = os.path.expanduser("~/.ask_uploads")
 TOKEN_FILE = os.path.expanduser("~/.claude_token")
+CONVERSATION_JOURNAL_FILE = os.path.expanduser("~/.ask_conversation_journal")
 
 # File paths - Legacy (for backward compatibility)
 LEGACY_HISTORY_FILE = os.path.expanduser("~/.claude_history")
@@ -24,6 +26,15 @@ DEFAULT_MODEL = "claude-sonnet-4-6"
 DEFAULT_MAX_TOKENS = 1024
 DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
 
+# Conversation persistence
+CONVERSATION_SAVE_INTERVAL = 10  # Turns journaled between full state saves
+
+# Upload configuration
+UPLOAD_MAX_WORKERS = 8  # Threads used to prepare files for upload
+UPLOAD_DIRECT_THRESHOLD = 1024 * 1024  # Send larger images via the Files API
+UPLOAD_DIRECT_MAX_WORKERS = 4  # Concurrent Files API uploads
+FILES_API_BETA = "files-api-2025-04-14"
+
 # UI Configuration - The Spinner Symphony!
 SPINNER_FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]  # Classic dots
 
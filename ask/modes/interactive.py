@@ -4,15 +4,13 @@ Interactive command mode for Claude CLI with improved text file handling
 
 import os
 import random
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.enums import EditingMode
-from prompt_toolkit.formatted_text import ANSI
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.key_binding import KeyBindings
+import sys
+from collections import deque
+from typing import List, Optional, Tuple
 
 from ..api.client import ClaudeClient
 from ..constants import (
+    CONVERSATION_SAVE_INTERVAL,
     DEFAULT_SYSTEM_PROMPT,
     HISTORY_FILE,
     RESPONSE_INTROS,
@@ -22,8 +20,9 @@ from ..utils.colors import Colors
 from ..utils.config_loader import ConfigLoader
 from ..utils.io import (
     append_to_conversation_log,
+    journal_interaction,
     load_conversation_state_with_timeout,
-    prepare_files_for_upload,
+    prepare_files_for_upload_parallel,
     resolve_file_paths,
     save_conversation_state,
 )
@@ -31,6 +30,7 @@ from ..utils.output_formatter import (
     print_error,
     print_info,
     print_response,
+    print_response_intro,
 )
 from ..utils.spinner import Spinner
 from ..utils.theme_config import theme_config
@@ -39,6 +39,7 @@ from ..utils.variables import process_input as process_variables
 
 def setup_key_bindings():
     """Set up vim-style key bindings"""
+    from prompt_toolkit.key_binding import KeyBindings
     from prompt_toolkit.key_binding.bindings.vi import load_vi_bindings
 
     kb = KeyBindings()
@@ -48,13 +49,64 @@ def setup_key_bindings():
 
 def get_prompt_message():
     """Return simple prompt"""
+    from prompt_toolkit.formatted_text import ANSI
+
     return ANSI(f"{Colors.BRIGHT_GREEN}λ {Colors.RESET}")
 
 
+# Command aliases
+_EXIT_CMDS = frozenset({"exit", "quit"})
+_HELP_CMDS = frozenset({"help", "?"})
+
+# Flags accepted by the upload command
+_RECURSIVE_FLAGS = frozenset({"--recursive", "-r"})
+
+_HELP_TEXT = """\
+Available commands:
+  help, ? - Show this help
+  h      - Show full command history
+  h N    - Show last N command history entries
+  c      - Show full conversation history
+  c N    - Show last N conversation exchanges
+  clear  - Clear conversation history
+  upload <file1> [file2] ... - Upload files to AI
+    Options:
+      --recursive, -r - Include all files in directories
+  vars   - Show all stored variables
+  var=value - Set a variable (e.g., name=John)
+  exit   - Exit the program
+"""
+
+_INTRO_CYCLE = None
+
+
+def _next_intro():
+    """Return the next response intro from a reshuffled, non-repeating cycle"""
+    global _INTRO_CYCLE
+    intro = next(_INTRO_CYCLE, None) if _INTRO_CYCLE is not None else None
+    if intro is None:
+        shuffled = list(RESPONSE_INTROS)
+        random.shuffle(shuffled)
+        _INTRO_CYCLE = iter(shuffled)
+        intro = next(_INTRO_CYCLE)
+    return intro
+
+
+def _shorten(text, limit=50):
+    """Truncate text for one-line conversation summaries"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
 class InteractiveMode:
     """Interactive command mode for Claude AI"""
 
     def __init__(self):
+        # prompt_toolkit is only needed once an interactive session starts,
+        # so one-shot queries and --help don't pay for importing it
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.enums import EditingMode
+        from prompt_toolkit.history import FileHistory
+
         # Load custom system prompt or use default
         custom_prompt = ConfigLoader.get_system_prompt()
         self.system_prompt = custom_prompt if custom_prompt else DEFAULT_SYSTEM_PROMPT
@@ -64,6 +116,8 @@ class InteractiveMode:
         model_prefs = ConfigLoader.get_model_preferences()
         load_timeout = model_prefs.get("conversation_load_timeout", 3.0)
         self.interactions = load_conversation_state_with_timeout(timeout=load_timeout)
+        # Streaming shows text as it arrives but skips markdown rendering
+        self.stream_responses = model_prefs.get("stream_responses", False)
         self.session = PromptSession(
             history=FileHistory(HISTORY_FILE),
             key_bindings=setup_key_bindings(),
@@ -73,17 +127,86 @@ class InteractiveMode:
         # Ensure upload cache dir exists
         os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
 
+        # Reused for every request instead of building a spinner per turn
+        self.spinner = Spinner()
+
+        # Turns journaled since the last full save_conversation_state
+        self._unsaved_turns = 0
+
+        # History lines keyed by the history file's (mtime_ns, size), with
+        # the tail limit they were read with (None for the whole file)
+        self._history_cache: Optional[
+            Tuple[Tuple[int, int], Optional[int], List[str]]
+        ] = None
+        # Truncated (query, response) pairs, one per interaction
+        self._conversation_summaries = []
+        self._summaries_source = None
+
+        # Interactive commands: name -> (handler, accepts_arguments).
+        # Handlers get the stripped text after the command, or None if there
+        # was none.
+        self._commands = {
+            **dict.fromkeys(_EXIT_CMDS, (self._exit_command, False)),
+            **dict.fromkeys(_HELP_CMDS, (self._help_command, False)),
+            "h": (self._history_command, True),
+            "c": (self._conversation_command, True),
+            "clear": (self._clear_command, False),
+            "upload": (self._upload_command, True),
+            "vars": (self._vars_command, False),
+        }
+
+    def _read_history(self, n=None):
+        """Return history lines, re-reading HISTORY_FILE only when it changed
+
+        When ``n`` is positive only the last ``n`` lines are kept while
+        scanning the file. The cache remembers how many lines it holds so a
+        repeated ``h N`` (or a smaller N) with no new commands is free.
+        """
+        limit = n if n is not None and n > 0 else None
+        stat = os.stat(HISTORY_FILE)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._history_cache
+        if (
+            cached is None
+            or cached[0] != key
+            or (cached[1] is not None and (limit is None or limit > cached[1]))
+        ):
+            with open(HISTORY_FILE) as f:
+                lines = (line.strip() for line in f)
+                tail = deque((line for line in lines if line), maxlen=limit)
+            cached = self._history_cache = (key, limit, list(tail))
+        history = cached[2]
+        return history[-n:] if n is not None else history
+
+    def _summarize_conversation(self):
+        """Return truncated (query, response) pairs for all interactions
+
+        Summaries are computed once per interaction and extended as new
+        interactions are appended.
+        """
+        if self._summaries_source is not self.interactions or len(
+            self._conversation_summaries
+        ) > len(self.interactions):
+            self._conversation_summaries = []
+            self._summaries_source = self.interactions
+
+        summaries = self._conversation_summaries
+        for interaction in self.interactions[len(summaries) :]:
+            summaries.append(
+                (_shorten(interaction.query), _shorten(interaction.response))
+            )
+        return summaries
+
     def show_history(self, n=None):
         """Display command history, optionally limited to last n entries"""
         try:
-            with open(HISTORY_FILE) as f:
-                history = [line.strip() for line in f if line.strip()]
-                if n is not None:
-                    history = history[-n:]
-                for i, cmd in enumerate(history, 1):
-                    print(f"{i}. {cmd}")
+            history = self._read_history(n)
         except FileNotFoundError:
             print("No history found.")
+            return
+
+        for i, cmd in enumerate(history, 1):
+            print(f"{i}. {cmd}")
 
     def show_conversation(self, n=None):
         """Display conversation history, optionally limited to last n exchanges"""
@@ -91,34 +214,28 @@ class InteractiveMode:
             print("No conversation history found.")
             return
 
-        interactions_to_show = self.interactions
+        summaries = self._summarize_conversation()
         if n is not None:
-            interactions_to_show = self.interactions[-n:]
+            summaries = summaries[-n:]
+
+        # Resolve colors once and build the per-exchange template outside the loop
+        user_color = theme_config.get_color("user")
+        assistant_color = theme_config.get_color("assistant")
+        index_color = theme_config.get_color("index")
+        reset = Colors.RESET
+        template = (
+            f"{index_color}{{0}}.{reset} {user_color}User:{reset} {{1}}\n"
+            f"   {assistant_color}Claude:{reset} {{2}}\n"
+        )
 
-        for i, interaction in enumerate(interactions_to_show, 1):
-            user_short = (
-                interaction.query[:50] + "..."
-                if len(interaction.query) > 50
-                else interaction.query
-            )
-            user_color = theme_config.get_color("user")
-            assistant_color = theme_config.get_color("assistant")
-            index_color = theme_config.get_color("index")
-            print(
-                f"{index_color}{i}.{Colors.RESET} {user_color}User:{Colors.RESET} {user_short}"
-            )
-            assistant_short = (
-                interaction.response[:50] + "..."
-                if len(interaction.response) > 50
-                else interaction.response
-            )
-            print(f"   {assistant_color}Claude:{Colors.RESET} {assistant_short}")
-            print()
+        for i, (user_short, assistant_short) in enumerate(summaries, 1):
+            print(template.format(i, user_short, assistant_short))
 
     def clear_conversation(self):
         """Clear the conversation history"""
         self.interactions = []
-        save_conversation_state(self.interactions)
+        self._conversation_summaries = []
+        self.save_state()
         print("Conversation history cleared.")
 
     def handle_upload_command(self, args):
@@ -128,9 +245,14 @@ class InteractiveMode:
             return True
 
         # Parse flags
-        recursive = "--recursive" in args or "-r" in args
-        if recursive:
-            args = [arg for arg in args if arg not in ["--recursive", "-r"]]
+        recursive = False
+        patterns = []
+        for arg in args:
+            if arg in _RECURSIVE_FLAGS:
+                recursive = True
+            else:
+                patterns.append(arg)
+        args = patterns
 
         # Resolve all file paths
         file_paths = resolve_file_paths(args, allow_directories=recursive)
@@ -145,7 +267,9 @@ class InteractiveMode:
         print(
             f"{Colors.BLUE}Processing {len(file_paths)} files for upload...{Colors.RESET}"
         )
-        uploaded_files, text_files_content = prepare_files_for_upload(file_paths)
+        uploaded_files, text_files_content = prepare_files_for_upload_parallel(
+            file_paths
+        )
 
         # Display summary
         image_files_count = len(uploaded_files)
@@ -173,83 +297,153 @@ class InteractiveMode:
         )
         message = input("> ")
 
+        # Send large images through the Files API so the request only
+        # carries references to them
+        direct_count = self.client.upload_large_files(uploaded_files)
+        if direct_count:
+            print_info(f"Uploaded {direct_count} large files directly.")
+
         # Generate response with the uploaded files
-        spinner = Spinner()
+        try:
+            self.stream_reply(message, uploaded_files, text_files_content)
+        finally:
+            if direct_count:
+                self.client.delete_uploaded_files(uploaded_files)
+        return True
+
+    def stream_reply(self, prompt, files=None, text_files_content=None):
+        """
+        Get a response to prompt, display it and record the exchange.
+
+        The spinner runs until the response starts to arrive. With the
+        stream_responses preference set, chunks are then written straight to
+        the terminal in the response color; otherwise the complete response
+        is rendered with print_response, markdown included.
+
+        Returns:
+            str: The complete response text
+        """
+        turns_before = len(self.interactions)
+        spinner = self.spinner
         spinner.start()
-        response, self.interactions = self.client.generate_response(
-            message,
-            self.system_prompt,
-            self.interactions,
-            uploaded_files,
-            text_files_content,
-        )
-        spinner.stop()
-        intro = random.choice(RESPONSE_INTROS)
-        print_response(intro, response)
+        stream = self.stream_responses
+        response_color = theme_config.get_color("response")
+        parts = []
+        try:
+            for chunk in self.client.stream_response(
+                prompt,
+                self.system_prompt,
+                self.interactions,
+                files,
+                text_files_content,
+            ):
+                if stream and not parts:
+                    spinner.stop()
+                    print_response_intro(_next_intro())
+                    sys.stdout.write(response_color)
+                parts.append(chunk)
+                if stream:
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+        finally:
+            spinner.stop()
+            if stream and parts:
+                sys.stdout.write(f"{Colors.RESET}\n")
+                sys.stdout.flush()
+
+        response = "".join(parts)
+        if not stream and parts:
+            print_response(_next_intro(), response)
+
+        if len(self.interactions) > turns_before:
+            self.record_interaction(self.interactions[-1])
+        return response
+
+    def record_interaction(self, interaction):
+        """
+        Persist a new interaction without rewriting the whole conversation.
+
+        The interaction is appended to the journal and the markdown log. A
+        full save runs every CONVERSATION_SAVE_INTERVAL turns, which also
+        clears the journal.
+        """
+        journal_interaction(interaction)
+        append_to_conversation_log(interaction)
+        self._unsaved_turns += 1
+        if self._unsaved_turns >= CONVERSATION_SAVE_INTERVAL:
+            self.save_state()
+
+    def save_state(self):
+        """Write the full conversation state and reset the journal"""
         save_conversation_state(self.interactions)
-        # Log the latest interaction to markdown file
-        if self.interactions:
-            append_to_conversation_log(self.interactions[-1])
-        return True
+        self._unsaved_turns = 0
 
-    def process_input(self, user_prompt):
-        """Process user input and execute appropriate action"""
-        # Check for special commands first (before variable processing)
-        if user_prompt.lower() in ["exit", "quit"]:
-            save_conversation_state(self.interactions)
-            return False
-        if user_prompt.lower() == "h":
+    def _exit_command(self, args):
+        """Save the conversation and stop the main loop"""
+        self.save_state()
+        return False
+
+    def _history_command(self, args):
+        """Handle `h` and `h N`"""
+        if args is None:
             self.show_history()
             return True
-        if user_prompt.lower().startswith("h "):
-            try:
-                n = int(user_prompt.split()[1])
-                self.show_history(n)
-            except (IndexError, ValueError):
-                print("Usage: h <number> - shows last N entries from history")
-            return True
-        if user_prompt.lower() == "c":
+        try:
+            self.show_history(int(args))
+        except ValueError:
+            print("Usage: h <number> - shows last N entries from history")
+        return True
+
+    def _conversation_command(self, args):
+        """Handle `c` and `c N`"""
+        if args is None:
             self.show_conversation()
             return True
-        if user_prompt.lower().startswith("c "):
-            try:
-                n = int(user_prompt.split()[1])
-                self.show_conversation(n)
-            except (IndexError, ValueError):
-                print("Usage: c <number> - shows last N conversation exchanges")
-            return True
-        if user_prompt.lower() == "clear":
-            self.clear_conversation()
-            return True
-        if user_prompt.lower().startswith("upload "):
-            args = user_prompt.split()[1:]
-            return self.handle_upload_command(args)
-        if user_prompt.lower() in ["help", "?"]:
-            print("Available commands:")
-            print("  help, ? - Show this help")
-            print("  h      - Show full command history")
-            print("  h N    - Show last N command history entries")
-            print("  c      - Show full conversation history")
-            print("  c N    - Show last N conversation exchanges")
-            print("  clear  - Clear conversation history")
-            print("  upload <file1> [file2] ... - Upload files to AI")
-            print("    Options:")
-            print("      --recursive, -r - Include all files in directories")
-            print("  vars   - Show all stored variables")
-            print("  var=value - Set a variable (e.g., name=John)")
-            print("  exit   - Exit the program")
-            return True
-        if user_prompt.lower() == "vars":
-            from ..utils.variables import get_variable_manager
-
-            variables = get_variable_manager().list_variables()
-            if variables:
-                print("Stored variables:")
-                for name, value in variables.items():
-                    print(f"  {name} = {value}")
-            else:
-                print("No variables stored")
-            return True
+        try:
+            self.show_conversation(int(args))
+        except ValueError:
+            print("Usage: c <number> - shows last N conversation exchanges")
+        return True
+
+    def _clear_command(self, args):
+        """Handle `clear`"""
+        self.clear_conversation()
+        return True
+
+    def _upload_command(self, args):
+        """Handle `upload <file1> [file2] ...`"""
+        return self.handle_upload_command(args.split() if args else [])
+
+    def _help_command(self, args):
+        """Handle `help` and `?`"""
+        print(_HELP_TEXT, end="")
+        return True
+
+    def _vars_command(self, args):
+        """Handle `vars`"""
+        from ..utils.variables import get_variable_manager
+
+        variables = get_variable_manager().list_variables()
+        if variables:
+            print("Stored variables:")
+            for name, value in variables.items():
+                print(f"  {name} = {value}")
+        else:
+            print("No variables stored")
+        return True
+
+    def process_input(self, user_prompt):
+        """Process user input and execute appropriate action"""
+        # Check for special commands first (before variable processing)
+        parts = user_prompt.strip().split(None, 1)
+        entry = self._commands.get(parts[0].casefold()) if parts else None
+        if entry is not None:
+            handler, accepts_args = entry
+            if len(parts) == 1:
+                return handler(None)
+            if accepts_args:
+                return handler(parts[1])
+
         # Now handle variable assignments and interpolation
         processed_prompt, was_assignment = process_variables(user_prompt)
 
@@ -261,28 +455,18 @@ class InteractiveMode:
         # Use the processed prompt for further command processing
         user_prompt = processed_prompt
 
-        spinner = Spinner()
-        spinner.start()
-        response, self.interactions = self.client.generate_response(
-            user_prompt, self.system_prompt, self.interactions
-        )
-        spinner.stop()
-        intro = random.choice(RESPONSE_INTROS)
-        print_response(intro, response)
-        save_conversation_state(self.interactions)
-        # Log the latest interaction to markdown file
-        if self.interactions:
-            append_to_conversation_log(self.interactions[-1])
+        self.stream_reply(user_prompt)
         return True
 
     def run(self):
         """Run the interactive mode main loop"""
 
-        while True:
-            try:
-                user_input = self.session.prompt()
-                if not self.process_input(user_input):
+        with self.client:
+            while True:
+                try:
+                    user_input = self.session.prompt()
+                    if not self.process_input(user_input):
+                        break
+                except (KeyboardInterrupt, EOFError):
+                    self.save_state()
                     break
-            except (KeyboardInterrupt, EOFError):
-                save_conversation_state(self.interactions)
-                break
@@ -5,13 +5,16 @@ This module provides decorators to simplify plugin development
 and registration.
 """
 
-from functools import wraps
-from typing import Callable
+from typing import Any, Callable, TypeVar
 
 from .base import PluginMetadata, PluginPriority, PluginType
 
+F = TypeVar("F", bound=Callable[..., Any])
 
-def plugin_hook(hook_name: str, priority: PluginPriority = PluginPriority.NORMAL):
+
+def plugin_hook(
+    hook_name: str, priority: PluginPriority = PluginPriority.NORMAL
+) -> Callable[[F], F]:
     """
     Decorator to mark a function as a plugin hook.
 
@@ -20,19 +23,15 @@ def plugin_hook(hook_name: str, priority: PluginPriority = PluginPriority.NORMAL
         priority: Execution priority
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add hook metadata
-        wrapper._plugin_hook = hook_name
-        wrapper._plugin_priority = priority
+        setattr(func, "_plugin_hook", hook_name)
+        setattr(func, "_plugin_priority", priority)
 
-        return wrapper
+        return func
 
     return decorator
 
@@ -44,7 +43,7 @@ def command_plugin(
     version: str = "1.0.0",
     author: str = "Unknown",
     priority: PluginPriority = PluginPriority.NORMAL,
-):
+) -> Callable[[F], F]:
     """
     Decorator to create a command plugin from a function.
 
@@ -57,16 +56,12 @@ def command_plugin(
         priority: Execution priority
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add command metadata
-        wrapper._plugin_metadata = PluginMetadata(
+        metadata = PluginMetadata(
             name=name,
             version=version,
             description=description,
@@ -74,11 +69,12 @@ def command_plugin(
             plugin_type=PluginType.COMMAND,
             priority=priority,
         )
-        wrapper._command_name = name
-        wrapper._command_help = help_text or description
-        wrapper._is_command_plugin = True
+        setattr(func, "_plugin_metadata", metadata)
+        setattr(func, "_command_name", name)
+        setattr(func, "_command_help", help_text or description)
+        setattr(func, "_is_command_plugin", True)
 
-        return wrapper
+        return func
 
     return decorator
 
@@ -90,7 +86,7 @@ def filter_plugin(
     author: str = "Unknown",
     priority: PluginPriority = PluginPriority.NORMAL,
     filter_type: str = "both",  # "input", "output", or "both"
-):
+) -> Callable[[F], F]:
     """
     Decorator to create a filter plugin from a function.
 
@@ -103,16 +99,12 @@ def filter_plugin(
         filter_type: Type of filtering ("input", "output", or "both")
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add filter metadata
-        wrapper._plugin_metadata = PluginMetadata(
+        metadata = PluginMetadata(
             name=name,
             version=version,
             description=description,
@@ -120,10 +112,11 @@ def filter_plugin(
             plugin_type=PluginType.FILTER,
             priority=priority,
         )
-        wrapper._filter_type = filter_type
-        wrapper._is_filter_plugin = True
+        setattr(func, "_plugin_metadata", metadata)
+        setattr(func, "_filter_type", filter_type)
+        setattr(func, "_is_filter_plugin", True)
 
-        return wrapper
+        return func
 
     return decorator
 
@@ -135,7 +128,7 @@ def formatter_plugin(
     version: str = "1.0.0",
     author: str = "Unknown",
     priority: PluginPriority = PluginPriority.NORMAL,
-):
+) -> Callable[[F], F]:
     """
     Decorator to create a formatter plugin from a function.
 
@@ -148,16 +141,12 @@ def formatter_plugin(
         priority: Execution priority
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add formatter metadata
-        wrapper._plugin_metadata = PluginMetadata(
+        metadata = PluginMetadata(
             name=name,
             version=version,
             description=description,
@@ -165,10 +154,11 @@ def formatter_plugin(
             plugin_type=PluginType.FORMATTER,
             priority=priority,
         )
-        wrapper._format_name = format_name
-        wrapper._is_formatter_plugin = True
+        setattr(func, "_plugin_metadata", metadata)
+        setattr(func, "_format_name", format_name)
+        setattr(func, "_is_formatter_plugin", True)
 
-        return wrapper
+        return func
 
     return decorator
 
@@ -179,7 +169,7 @@ def preprocessor_plugin(
     version: str = "1.0.0",
     author: str = "Unknown",
     priority: PluginPriority = PluginPriority.NORMAL,
-):
+) -> Callable[[F], F]:
     """
     Decorator to create a preprocessor plugin from a function.
 
@@ -191,16 +181,12 @@ def preprocessor_plugin(
         priority: Execution priority
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add preprocessor metadata
-        wrapper._plugin_metadata = PluginMetadata(
+        metadata = PluginMetadata(
             name=name,
             version=version,
             description=description,
@@ -208,9 +194,10 @@ def preprocessor_plugin(
             plugin_type=PluginType.PREPROCESSOR,
             priority=priority,
         )
-        wrapper._is_preprocessor_plugin = True
+        setattr(func, "_plugin_metadata", metadata)
+        setattr(func, "_is_preprocessor_plugin", True)
 
-        return wrapper
+        return func
 
     return decorator
 
@@ -221,7 +208,7 @@ def postprocessor_plugin(
     version: str = "1.0.0",
     author: str = "Unknown",
     priority: PluginPriority = PluginPriority.NORMAL,
-):
+) -> Callable[[F], F]:
     """
     Decorator to create a postprocessor plugin from a function.
 
@@ -233,16 +220,12 @@ def postprocessor_plugin(
         priority: Execution priority
 
     Returns:
-        Decorated function
+        The original function with plugin metadata attached
     """
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
-
+    def decorator(func: F) -> F:
         # Add postprocessor metadata
-        wrapper._plugin_metadata = PluginMetadata(
+        metadata = PluginMetadata(
             name=name,
             version=version,
             description=description,
@@ -250,8 +233,9 @@ def postprocessor_plugin(
             plugin_type=PluginType.POSTPROCESSOR,
             priority=priority,
         )
-        wrapper._is_postprocessor_plugin = True
+        setattr(func, "_plugin_metadata", metadata)
+        setattr(func, "_is_postprocessor_plugin", True)
 
-        return wrapper
+        return func
 
     return decorator
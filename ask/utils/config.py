@@ -26,6 +26,7 @@ class APIConfig:
     temperature: float = 0.7
     timeout: int = 30
     max_retries: int = 3
+    max_connections: int = 100
     base_url: Optional[str] = None
 
 
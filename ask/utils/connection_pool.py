@@ -6,19 +6,47 @@ for efficient API communication with rate limiting and retry logic.
 """
 
 import asyncio
+import random
+import sys
 import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import aiohttp
 
+from ..utils import fast_json
 from ..utils.config import get_config
 from ..utils.exceptions import APIError, NetworkError, RateLimitError
 from ..utils.logging import get_logger
 
+# aiodns is optional; without it aiohttp resolves hosts with getaddrinfo
+# in a thread pool
+try:
+    import aiodns  # noqa: F401
+    from aiohttp.resolver import AsyncResolver
+except ImportError:
+    AsyncResolver = None
+
 logger = get_logger(__name__)
 
+# Rate limit windows in nanoseconds
+_MINUTE_NS = 60_000_000_000
+_HOUR_NS = 60 * _MINUTE_NS
+_DAY_NS = 24 * _HOUR_NS
+
+
+def _create_resolver() -> Optional["AsyncResolver"]:
+    """
+    Create a c-ares backed DNS resolver when aiodns is installed.
+
+    Returns None (aiohttp's default threaded resolver) when aiodns is missing
+    or on Windows, where aiodns needs the selector event loop.
+    """
+    if AsyncResolver is None or sys.platform == "win32":
+        return None
+    return AsyncResolver()
+
 
 @dataclass
 class ConnectionStats:
@@ -37,7 +65,15 @@ class ConnectionStats:
 
 @dataclass
 class RateLimitConfig:
-    """Rate limiting configuration."""
+    """
+    Rate limiting configuration.
+
+    Limits are enforced with three token buckets (per minute, hour and day).
+    Each bucket holds up to its limit in tokens and refills continuously at
+    limit/period tokens per second, so every check is a few float operations.
+    Times are time.monotonic_ns() integers, so wall-clock jumps can't skew
+    them; seconds only appear in the wait time handed back to callers.
+    """
 
     max_requests_per_minute: int = 60
     max_requests_per_hour: int = 3600
@@ -45,61 +81,114 @@ class RateLimitConfig:
     backoff_factor: float = 1.5
     max_backoff_time: float = 300.0  # 5 minutes
 
-    # Track request timestamps
-    request_timestamps: List[float] = field(default_factory=list)
-
-    def can_make_request(self) -> bool:
-        """Check if we can make a request based on rate limits."""
-        current_time = time.time()
+    last_refill_ns: int = field(default_factory=time.monotonic_ns)
+
+    # Token buckets, filled to their limits by __post_init__
+    minute_tokens: float = field(init=False)
+    hour_tokens: float = field(init=False)
+    day_tokens: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        for name in (
+            "max_requests_per_minute",
+            "max_requests_per_hour",
+            "max_requests_per_day",
+        ):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive")
+        self.minute_tokens = float(self.max_requests_per_minute)
+        self.hour_tokens = float(self.max_requests_per_hour)
+        self.day_tokens = float(self.max_requests_per_day)
+
+    def _refill(self, now_ns: int) -> None:
+        """Add the tokens earned since the last refill, capped at each limit."""
+        elapsed_ns = now_ns - self.last_refill_ns
+        if elapsed_ns <= 0:
+            return
+        self.last_refill_ns = now_ns
+        self.minute_tokens = min(
+            self.max_requests_per_minute,
+            self.minute_tokens + elapsed_ns * self.max_requests_per_minute / _MINUTE_NS,
+        )
+        self.hour_tokens = min(
+            self.max_requests_per_hour,
+            self.hour_tokens + elapsed_ns * self.max_requests_per_hour / _HOUR_NS,
+        )
+        self.day_tokens = min(
+            self.max_requests_per_day,
+            self.day_tokens + elapsed_ns * self.max_requests_per_day / _DAY_NS,
+        )
 
-        # Clean old timestamps
-        self._clean_old_timestamps(current_time)
+    def can_make_request(self, now_ns: Optional[int] = None) -> bool:
+        """
+        Check if we can make a request based on rate limits.
 
-        # Check minute limit
-        minute_ago = current_time - 60
-        recent_requests = len([t for t in self.request_timestamps if t > minute_ago])
-        if recent_requests >= self.max_requests_per_minute:
-            return False
+        Args:
+            now_ns: Current time.monotonic_ns() value; read from the clock if
+                omitted
+        """
+        self._refill(time.monotonic_ns() if now_ns is None else now_ns)
+        return min(self.minute_tokens, self.hour_tokens, self.day_tokens) >= 1
 
-        # Check hour limit
-        hour_ago = current_time - 3600
-        hour_requests = len([t for t in self.request_timestamps if t > hour_ago])
-        if hour_requests >= self.max_requests_per_hour:
+    def _try_consume(self) -> bool:
+        """Take one token from every bucket if all of them have one."""
+        if min(self.minute_tokens, self.hour_tokens, self.day_tokens) < 1:
             return False
+        self.minute_tokens -= 1
+        self.hour_tokens -= 1
+        self.day_tokens -= 1
+        return True
 
-        # Check day limit
-        day_ago = current_time - 86400
-        day_requests = len([t for t in self.request_timestamps if t > day_ago])
-        if day_requests >= self.max_requests_per_day:
-            return False
+    def try_acquire(self, now_ns: Optional[int] = None) -> bool:
+        """
+        Consume one token from every bucket if a request is allowed now.
 
-        return True
+        Args:
+            now_ns: Current time.monotonic_ns() value; read from the clock if
+                omitted
 
-    def record_request(self) -> None:
-        """Record a request timestamp."""
-        self.request_timestamps.append(time.time())
+        Returns:
+            True if the tokens were taken, False if the caller must wait
+        """
+        self._refill(time.monotonic_ns() if now_ns is None else now_ns)
+        return self._try_consume()
 
-    def _clean_old_timestamps(self, current_time: float) -> None:
-        """Remove timestamps older than 24 hours."""
-        day_ago = current_time - 86400
-        self.request_timestamps = [t for t in self.request_timestamps if t > day_ago]
+    def record_request(self, now_ns: Optional[int] = None) -> None:
+        """
+        Consume one token from every bucket.
 
-    def get_wait_time(self) -> float:
-        """Get the time to wait before next request."""
-        if self.can_make_request():
-            return 0.0
+        Unlike try_acquire this records a request that was sent regardless,
+        so an empty bucket stays at zero rather than going into debt.
 
-        current_time = time.time()
+        Args:
+            now_ns: Current time.monotonic_ns() value; read from the clock if
+                omitted
+        """
+        self._refill(time.monotonic_ns() if now_ns is None else now_ns)
+        self.minute_tokens = max(0.0, self.minute_tokens - 1)
+        self.hour_tokens = max(0.0, self.hour_tokens - 1)
+        self.day_tokens = max(0.0, self.day_tokens - 1)
 
-        # Check which limit is hit and return appropriate wait time
-        minute_ago = current_time - 60
-        recent_requests = [t for t in self.request_timestamps if t > minute_ago]
+    def get_wait_time(self, now_ns: Optional[int] = None) -> float:
+        """
+        Get the time to wait before next request.
 
-        if len(recent_requests) >= self.max_requests_per_minute:
-            # Wait until oldest request in the minute window expires
-            return recent_requests[0] + 60 - current_time + 1
+        Args:
+            now_ns: Current time.monotonic_ns() value; read from the clock if
+                omitted
+        """
+        self._refill(time.monotonic_ns() if now_ns is None else now_ns)
 
-        return 60.0  # Default wait time
+        # Time until every deficient bucket has refilled to one token
+        wait_time = 0.0
+        for tokens, limit, period in (
+            (self.minute_tokens, self.max_requests_per_minute, 60),
+            (self.hour_tokens, self.max_requests_per_hour, 3600),
+            (self.day_tokens, self.max_requests_per_day, 86400),
+        ):
+            if tokens < 1:
+                wait_time = max(wait_time, (1 - tokens) * period / limit)
+        return wait_time
 
 
 class ConnectionPool:
@@ -116,11 +205,16 @@ class ConnectionPool:
 
     def __init__(
         self,
-        max_connections: int = 10,
-        max_connections_per_host: int = 5,
+        max_connections: int = 100,
+        max_connections_per_host: int = 30,
         timeout: float = 30.0,
         max_retries: int = 3,
         rate_limit_config: Optional[RateLimitConfig] = None,
+        ttl_dns_cache: int = 10,
+        per_attempt_timeout: Optional[float] = None,
+        total_deadline: Optional[float] = None,
+        enable_cleanup_closed: bool = False,
+        keepalive_timeout: float = 60.0,
     ):
         """
         Initialize connection pool.
@@ -131,18 +225,54 @@ class ConnectionPool:
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
             rate_limit_config: Rate limiting configuration
+            ttl_dns_cache: Seconds to cache resolved host addresses. Short
+                values let requests follow round-robin DNS across load
+                balancer IPs; long values save lookups but pin traffic to
+                whichever address was resolved first.
+            per_attempt_timeout: Wall-clock limit in seconds for each attempt
+                to get a response, so one slow attempt can't use up the whole
+                budget before a retry
+            total_deadline: Overall limit in seconds for a request including
+                retries; no retry is started that would end past it
+            enable_cleanup_closed: Have aiohttp force-close aborted TLS
+                transports. This works around servers and proxies that don't
+                complete SSL shutdown, and costs a periodic timer for the
+                pool's lifetime, so it is off unless needed.
+            keepalive_timeout: Seconds an idle connection is kept for reuse.
+                aiohttp reuses the most recently released connection first,
+                so a small set stays warm and surplus connections age out
+                after this long.
         """
         self.max_connections = max_connections
         self.max_connections_per_host = max_connections_per_host
         self.timeout = timeout
         self.max_retries = max_retries
         self.rate_limit = rate_limit_config or RateLimitConfig()
+        self.ttl_dns_cache = ttl_dns_cache
+        self.per_attempt_timeout = per_attempt_timeout
+        self.total_deadline = total_deadline
+        self.enable_cleanup_closed = enable_cleanup_closed
+        self.keepalive_timeout = keepalive_timeout
+
+        # Backoff before each retry, capped; jitter is applied per retry
+        rate_limit = self.rate_limit
+        self._backoff = tuple(
+            min(1.0 * rate_limit.backoff_factor**attempt, rate_limit.max_backoff_time)
+            for attempt in range(max_retries + 1)
+        )
 
         self._session: Optional[aiohttp.ClientSession] = None
         self._connector: Optional[aiohttp.TCPConnector] = None
         self._stats = ConnectionStats()
         self._closed = False
 
+        # EWMA weight for response times; 1.0 makes the first sample the seed
+        self._response_time_weight = 1.0
+
+        # Connector-derived stats are refreshed at most once per TTL
+        self._stats_cache_ttl = 1.0
+        self._stats_cached_at: Optional[float] = None
+
         # Create timeout configuration
         self._timeout = aiohttp.ClientTimeout(
             total=timeout, connect=timeout / 3, sock_read=timeout / 3
@@ -166,8 +296,10 @@ class ConnectionPool:
         self._connector = aiohttp.TCPConnector(
             limit=self.max_connections,
             limit_per_host=self.max_connections_per_host,
-            enable_cleanup_closed=True,
-            ttl_dns_cache=300,  # 5 minutes DNS cache
+            resolver=_create_resolver(),
+            enable_cleanup_closed=self.enable_cleanup_closed,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
             use_dns_cache=True,
         )
 
@@ -220,37 +352,44 @@ class ConnectionPool:
         if self._session is None:
             await self.initialize()
 
-        # Check rate limits
+        # Wait for and take a rate limit token
         await self._check_rate_limits()
-
-        # Record request
-        self.rate_limit.record_request()
         self._stats.total_requests += 1
 
+        deadline = None
+        if self.total_deadline is not None:
+            deadline = time.monotonic() + self.total_deadline
+
         # Retry loop
         last_exception = None
         for attempt in range(self.max_retries + 1):
             try:
-                start_time = time.time()
+                start_time = time.monotonic()
 
                 # Make request
-                response = await self._session.request(method, url, **kwargs)
+                pending = self._session.request(method, url, **kwargs)
+                if self.per_attempt_timeout is None:
+                    response = await pending
+                else:
+                    response = await asyncio.wait_for(pending, self.per_attempt_timeout)
 
                 # Update stats
-                response_time = time.time() - start_time
+                response_time = time.monotonic() - start_time
                 self._update_response_time(response_time)
 
                 # Check for API errors
                 if response.status >= 400:
-                    error_text = await response.text()
                     if response.status == 429:
-                        # Rate limit error
+                        # Rate limit error - only the header matters, so
+                        # release the connection without reading the body
                         retry_after = response.headers.get("Retry-After")
                         wait_time = int(retry_after) if retry_after else 60
+                        response.release()
                         raise RateLimitError(
                             f"Rate limit exceeded: {response.status}",
                             retry_after=wait_time,
                         )
+                    error_text = await response.text()
                     if response.status >= 500:
                         # Server error - retry
                         raise NetworkError(
@@ -269,8 +408,11 @@ class ConnectionPool:
                 last_exception = e
                 self._stats.failed_requests += 1
 
-                if attempt < self.max_retries:
-                    wait_time = self._calculate_backoff_time(attempt)
+                wait_time = self._calculate_backoff_time(attempt)
+                out_of_time = (
+                    deadline is not None and time.monotonic() + wait_time >= deadline
+                )
+                if attempt < self.max_retries and not out_of_time:
                     logger.warning(
                         f"Request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}"
                     )
@@ -278,47 +420,71 @@ class ConnectionPool:
                     await asyncio.sleep(wait_time)
                     self._stats.retry_count += 1
                 else:
-                    logger.error(
-                        f"Request failed after {self.max_retries + 1} attempts: {e}"
-                    )
+                    logger.error(f"Request failed after {attempt + 1} attempts: {e}")
                     self._stats.last_error = str(e)
                     self._stats.last_error_time = time.time()
                     raise NetworkError(
-                        f"Request failed after {self.max_retries + 1} attempts: {e}"
+                        f"Request failed after {attempt + 1} attempts: {e}"
                     )
 
         # This should never be reached
         raise NetworkError("Unexpected error in request retry loop")
 
     async def _check_rate_limits(self) -> None:
-        """Check and enforce rate limits."""
-        if not self.rate_limit.can_make_request():
-            wait_time = self.rate_limit.get_wait_time()
+        """
+        Wait until a request is allowed and consume its rate limit token.
+
+        There is no await between the check and the token deduction, so they
+        run as one step on the event loop and concurrent callers cannot all
+        slip past the same limit.
+        """
+        while True:
+            now_ns = time.monotonic_ns()
+            if self.rate_limit.try_acquire(now_ns):
+                return
+            wait_time = self.rate_limit.get_wait_time(now_ns)
             logger.warning(f"Rate limit reached, waiting {wait_time:.1f} seconds")
             await asyncio.sleep(wait_time)
 
     def _calculate_backoff_time(self, attempt: int) -> float:
-        """Calculate exponential backoff time."""
-        base_wait = 1.0 * (self.rate_limit.backoff_factor**attempt)
-        return min(base_wait, self.rate_limit.max_backoff_time)
+        """
+        Calculate exponential backoff time.
+
+        The precomputed delay is scaled by a random factor in [0.5, 1.5) so
+        clients that failed together don't all retry at the same moment.
+        """
+        return self._backoff[attempt] * random.uniform(0.5, 1.5)
 
     def _update_response_time(self, response_time: float) -> None:
-        """Update average response time."""
-        if self._stats.average_response_time == 0:
-            self._stats.average_response_time = response_time
-        else:
-            # Simple moving average
-            self._stats.average_response_time = (
-                self._stats.average_response_time * 0.9 + response_time * 0.1
-            )
+        """Update the exponentially weighted average response time."""
+        stats = self._stats
+        stats.average_response_time += self._response_time_weight * (
+            response_time - stats.average_response_time
+        )
+        self._response_time_weight = 0.1
 
     def get_stats(self) -> ConnectionStats:
-        """Get connection pool statistics."""
-        if self._connector:
-            self._stats.active_connections = len(self._connector._conns)
+        """
+        Get connection pool statistics.
+
+        Request counters are always current. Active and idle connection
+        counts come from the connector and are refreshed at most once per
+        second, so frequent polling doesn't walk the connector's pools.
+        They read aiohttp's private bookkeeping, so a connector without it
+        reports zero rather than raising.
+        """
+        now = time.monotonic()
+        if self._connector and (
+            self._stats_cached_at is None
+            or now - self._stats_cached_at >= self._stats_cache_ttl
+        ):
+            self._stats.active_connections = len(
+                getattr(self._connector, "_acquired", ())
+            )
             self._stats.idle_connections = sum(
-                len(conns) for conns in self._connector._conns.values()
+                len(conns) for conns in getattr(self._connector, "_conns", {}).values()
             )
+            self._stats_cached_at = now
 
         return self._stats
 
@@ -326,6 +492,8 @@ class ConnectionPool:
         """Reset connection pool statistics."""
         self._stats = ConnectionStats()
         self._stats.total_connections = self.max_connections
+        self._stats_cached_at = None
+        self._response_time_weight = 1.0
 
 
 class AsyncAPIClient:
@@ -337,22 +505,37 @@ class AsyncAPIClient:
     """
 
     def __init__(
-        self, base_url: str, api_key: str, pool_config: Optional[Dict[str, Any]] = None
+        self,
+        base_url: str,
+        api_key: str,
+        pool_config: Optional[Dict[str, Any]] = None,
+        pool: Optional[ConnectionPool] = None,
     ):
         """
         Initialize API client.
 
+        Clients share the process-wide pool from get_global_pool() unless
+        given a pool or a pool_config, so short-lived clients reuse open
+        connections, TLS sessions and DNS results.
+
         Args:
             base_url: Base URL for API requests
             api_key: API key for authentication
-            pool_config: Connection pool configuration
+            pool_config: Configuration for a dedicated pool owned by this client
+            pool: Existing connection pool to use
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
 
-        # Create connection pool
-        pool_config = pool_config or {}
-        self.pool = ConnectionPool(**pool_config)
+        # Only a pool created here is closed with the client
+        self.pool = pool
+        self._owns_pool = False
+        if pool is None and pool_config:
+            self.pool = ConnectionPool(**pool_config)
+            self._owns_pool = True
+
+        # Full URLs by endpoint; endpoints are a small fixed set
+        self._url_cache: Dict[str, str] = {}
 
         # Common headers
         self.headers = {
@@ -363,12 +546,39 @@ class AsyncAPIClient:
 
     async def __aenter__(self):
         """Async context manager entry."""
-        await self.pool.initialize()
+        await self._get_pool()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self.pool.close()
+        if self._owns_pool:
+            await self.pool.close()
+
+    async def _get_pool(self) -> ConnectionPool:
+        """Return the pool in use, resolving the shared global pool lazily."""
+        if self.pool is None:
+            self.pool = await get_global_pool()
+        else:
+            await self.pool.initialize()
+        return self.pool
+
+    def _resolve_url(self, endpoint: str) -> str:
+        """Return the full URL for an endpoint, building it only once."""
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            self._url_cache[endpoint] = url
+        return url
+
+    def _request_headers(self, kwargs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Return the headers for a request, merging any per-call overrides.
+
+        The shared header dict is returned as-is unless the caller passed
+        ``headers`` in ``kwargs``, so the common case allocates nothing.
+        """
+        extra = kwargs.pop("headers", None)
+        return self.headers if extra is None else {**self.headers, **extra}
 
     async def post(
         self, endpoint: str, data: Dict[str, Any], **kwargs
@@ -384,15 +594,15 @@ class AsyncAPIClient:
         Returns:
             Response data
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._resolve_url(endpoint)
 
-        headers = self.headers.copy()
-        headers.update(kwargs.pop("headers", {}))
+        headers = self._request_headers(kwargs)
 
-        async with self.pool.request(
+        pool = await self._get_pool()
+        async with await pool.request(
             "POST", url, json=data, headers=headers, **kwargs
         ) as response:
-            return await response.json()
+            return await response.json(loads=fast_json.loads)
 
     async def get(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs
@@ -408,57 +618,90 @@ class AsyncAPIClient:
         Returns:
             Response data
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._resolve_url(endpoint)
 
-        headers = self.headers.copy()
-        headers.update(kwargs.pop("headers", {}))
+        headers = self._request_headers(kwargs)
 
-        async with self.pool.request(
+        pool = await self._get_pool()
+        async with await pool.request(
             "GET", url, params=params, headers=headers, **kwargs
         ) as response:
-            return await response.json()
+            return await response.json(loads=fast_json.loads)
 
-    async def stream_post(self, endpoint: str, data: Dict[str, Any], **kwargs):
+    async def stream_post(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ):
         """
         Make a streaming POST request.
 
         Args:
             endpoint: API endpoint
             data: Request data
+            chunk_size: Yield fixed-size chunks of this many bytes; by default
+                chunks are yielded as soon as they arrive, whatever their size
             **kwargs: Additional request parameters
 
         Yields:
             Response chunks
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._resolve_url(endpoint)
 
-        headers = self.headers.copy()
-        headers.update(kwargs.pop("headers", {}))
+        headers = self._request_headers(kwargs)
 
-        async with self.pool.request(
+        pool = await self._get_pool()
+        async with await pool.request(
             "POST", url, json=data, headers=headers, **kwargs
         ) as response:
-            async for chunk in response.content.iter_chunked(8192):
+            if chunk_size is None:
+                chunks = response.content.iter_any()
+            else:
+                chunks = response.content.iter_chunked(chunk_size)
+            async for chunk in chunks:
                 yield chunk
 
     def get_pool_stats(self) -> ConnectionStats:
         """Get connection pool statistics."""
+        if self.pool is None:
+            return ConnectionStats()
         return self.pool.get_stats()
 
 
 # Global connection pool instance
 _global_pool: Optional[ConnectionPool] = None
+# Serializes creation of the global pool; created on first use so it binds
+# to the running event loop
+_global_pool_lock: Optional[asyncio.Lock] = None
 
 
 async def get_global_pool() -> ConnectionPool:
-    """Get the global connection pool instance."""
-    global _global_pool
-    if _global_pool is None:
-        config = get_config()
-        _global_pool = ConnectionPool(
-            max_connections=config.api.max_retries * 2, timeout=config.api.timeout
-        )
-        await _global_pool.initialize()
+    """
+    Get the global connection pool instance.
+
+    Once the pool exists this returns without locking. Creation is done
+    under a lock so concurrent first callers share one pool instead of
+    each building (and leaking) their own.
+    """
+    global _global_pool, _global_pool_lock
+    if _global_pool is not None:
+        return _global_pool
+
+    if _global_pool_lock is None:
+        _global_pool_lock = asyncio.Lock()
+
+    async with _global_pool_lock:
+        if _global_pool is None:
+            config = get_config()
+            pool = ConnectionPool(
+                max_connections=config.api.max_connections,
+                max_retries=config.api.max_retries,
+                timeout=config.api.timeout,
+            )
+            await pool.initialize()
+            _global_pool = pool
     return _global_pool
 
 
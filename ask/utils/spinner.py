@@ -51,7 +51,13 @@ class Spinner:
         sys.stdout.flush()
 
     def start(self):
-        """Start the spinner animation in a separate thread"""
+        """Start the spinner animation in a separate thread
+
+        Calling start on a spinner that is already running does nothing, so a
+        single instance can be started and stopped repeatedly.
+        """
+        if self.spinning:
+            return
         self.spinning = True
         self.thread = threading.Thread(target=self.spin)
         self.thread.start()
@@ -61,3 +67,4 @@ class Spinner:
         self.spinning = False
         if hasattr(self, "thread") and self.thread is not None:
             self.thread.join()
+            self.thread = None
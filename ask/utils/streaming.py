@@ -6,19 +6,24 @@ the API, including real-time display, buffering, and event processing.
 """
 
 import asyncio
-import json
+import codecs
+import sys
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Union
 
 import aiohttp
 
+from ..utils import fast_json
 from ..utils.exceptions import APIError, NetworkError
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class StreamEventType(Enum):
     """Types of streaming events."""
@@ -30,7 +35,15 @@ class StreamEventType(Enum):
     METADATA = "metadata"
 
 
-@dataclass
+# Module-level aliases: enum members compare by identity, and a global
+# lookup is much cheaper than StreamEventType.CHUNK in per-chunk code
+_START = StreamEventType.START
+_CHUNK = StreamEventType.CHUNK
+_END = StreamEventType.END
+_ERROR = StreamEventType.ERROR
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class StreamEvent:
     """Streaming event data."""
 
@@ -48,43 +61,51 @@ class StreamBuffer:
     methods for processing chunks as they arrive.
     """
 
-    def __init__(self, max_size: int = 1024 * 1024):  # 1MB default
+    def __init__(self, max_size: int = 1024 * 1024, store_content: bool = True):
         """
         Initialize stream buffer.
 
         Args:
-            max_size: Maximum buffer size in bytes
+            max_size: Maximum buffer size in bytes (1MB by default)
+            store_content: Keep chunk data; when False only statistics are kept
         """
         self.max_size = max_size
-        self.buffer = []
+        self.store_content = store_content
+        self.buffer = bytearray()
         self.total_size = 0
         self.start_time = time.time()
         self.last_chunk_time = time.time()
         self.chunk_count = 0
 
-    def add_chunk(self, chunk: str) -> None:
+    def add_chunk(self, chunk: Union[bytes, str], now: Optional[float] = None) -> None:
         """
         Add a chunk to the buffer.
 
+        Raw bytes are stored as-is; text is decoded only once, in get_content.
+
         Args:
-            chunk: Data chunk to add
+            chunk: Data chunk to add, as raw bytes or text
+            now: Arrival time from time.time(), if the caller already has it
 
         Raises:
             ValueError: If buffer would exceed max size
         """
-        chunk_size = len(chunk.encode("utf-8"))
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
 
-        if self.total_size + chunk_size > self.max_size:
+        new_size = self.total_size + len(chunk)
+        if new_size > self.max_size:
             raise ValueError(f"Buffer would exceed max size ({self.max_size} bytes)")
 
-        self.buffer.append(chunk)
-        self.total_size += chunk_size
-        self.last_chunk_time = time.time()
+        if self.store_content:
+            self.buffer.extend(chunk)
+        self.total_size = new_size
+        self.last_chunk_time = time.time() if now is None else now
         self.chunk_count += 1
 
     def get_content(self) -> str:
         """Get the complete buffered content."""
-        return "".join(self.buffer)
+        return self.buffer.decode("utf-8", errors="replace")
 
     def clear(self) -> None:
         """Clear the buffer."""
@@ -121,6 +142,8 @@ class StreamProcessor:
         self,
         event_handler: Optional[Callable[[StreamEvent], None]] = None,
         buffer_size: int = 1024 * 1024,
+        store_events: bool = False,
+        store_content: bool = True,
     ):
         """
         Initialize stream processor.
@@ -128,9 +151,12 @@ class StreamProcessor:
         Args:
             event_handler: Optional event handler function
             buffer_size: Buffer size for streaming data
+            store_events: Keep every CHUNK event for get_events()
+            store_content: Keep the raw stream for get_content()
         """
         self.event_handler = event_handler
-        self.buffer = StreamBuffer(buffer_size)
+        self.buffer = StreamBuffer(buffer_size, store_content)
+        self.store_events = store_events
         self.events: List[StreamEvent] = []
         self.processing = False
 
@@ -154,17 +180,21 @@ class StreamProcessor:
                 event_type=StreamEventType.START,
                 data=None,
                 timestamp=time.time(),
-                metadata={"status": response.status, "headers": dict(response.headers)},
+                metadata={"status": response.status, "headers": response.headers},
             )
             yield start_event
 
             # Process chunks
             async for chunk in self._read_chunks(response):
+                # _read_chunks stamped the buffer when this chunk arrived
                 chunk_event = StreamEvent(
-                    event_type=StreamEventType.CHUNK, data=chunk, timestamp=time.time()
+                    event_type=_CHUNK,
+                    data=chunk,
+                    timestamp=self.buffer.last_chunk_time,
                 )
 
-                self.events.append(chunk_event)
+                if self.store_events:
+                    self.events.append(chunk_event)
                 if self.event_handler:
                     self.event_handler(chunk_event)
 
@@ -173,7 +203,7 @@ class StreamProcessor:
             # Send end event
             end_event = StreamEvent(
                 event_type=StreamEventType.END,
-                data=self.buffer.get_content(),
+                data=self.get_content(),
                 timestamp=time.time(),
                 metadata=self.buffer.get_stats(),
             )
@@ -203,12 +233,19 @@ class StreamProcessor:
         Yields:
             Data chunks
         """
+        # A multi-byte character may be split across chunks; the incremental
+        # decoder holds the partial bytes back until the rest arrives
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
         try:
-            async for chunk in response.content.iter_chunked(8192):
+            async for chunk in response.content.iter_any():
                 if chunk:
-                    text = chunk.decode("utf-8", errors="replace")
-                    self.buffer.add_chunk(text)
-                    yield text
+                    self.buffer.add_chunk(chunk, time.time())
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
 
         except asyncio.CancelledError:
             logger.info("Stream processing cancelled")
@@ -218,7 +255,7 @@ class StreamProcessor:
             raise NetworkError(f"Stream reading failed: {e}")
 
     def get_events(self) -> List[StreamEvent]:
-        """Get all processed events."""
+        """Get all processed events (empty unless store_events is set)."""
         return self.events.copy()
 
     def get_content(self) -> str:
@@ -238,11 +275,23 @@ class SSEProcessor(StreamProcessor):
     and data according to the SSE specification.
     """
 
-    def __init__(self, **kwargs):
-        """Initialize SSE processor."""
+    def __init__(self, raw_buffer: bool = False, **kwargs):
+        """
+        Initialize SSE processor.
+
+        Args:
+            raw_buffer: Keep the raw SSE stream, framing included, for
+                get_content(); by default only the parsed data payloads are kept
+            **kwargs: Passed to StreamProcessor
+        """
+        if not raw_buffer:
+            kwargs["store_content"] = False
         super().__init__(**kwargs)
+        self.raw_buffer = raw_buffer
         self.current_event = {}
         self.event_buffer = []
+        self._line_buf = bytearray()
+        self._payloads: List[str] = []
 
     async def _read_chunks(
         self, response: aiohttp.ClientResponse
@@ -256,57 +305,166 @@ class SSEProcessor(StreamProcessor):
         Yields:
             Parsed event data
         """
-        async for chunk in response.content.iter_chunked(8192):
-            if chunk:
-                text = chunk.decode("utf-8", errors="replace")
-                self.buffer.add_chunk(text)
+        line_buf = self._line_buf
+        line_buf.clear()
+        payloads = self._payloads
+        payloads.clear()
+        keep_payloads = not self.raw_buffer
 
-                # Parse SSE format
-                lines = text.split("\n")
-                for line in lines:
-                    event_data = self._parse_sse_line(line)
+        async for chunk in response.content.iter_any():
+            if chunk:
+                self.buffer.add_chunk(chunk, time.time())
+                line_buf.extend(chunk)
+
+                # Parse complete lines; a partial line waits for the next chunk
+                start = 0
+                idx = line_buf.find(b"\n")
+                while idx != -1:
+                    event_data = self._parse_sse_line(line_buf[start:idx])
                     if event_data:
-                        yield event_data
+                        text = event_data.decode("utf-8", errors="replace")
+                        if keep_payloads:
+                            payloads.append(text)
+                        yield text
+                    start = idx + 1
+                    idx = line_buf.find(b"\n", start)
+                del line_buf[:start]
+
+        if line_buf:
+            event_data = self._parse_sse_line(bytes(line_buf))
+            line_buf.clear()
+            if event_data:
+                text = event_data.decode("utf-8", errors="replace")
+                if keep_payloads:
+                    payloads.append(text)
+                yield text
+
+    def get_content(self) -> str:
+        """
+        Get the streamed content.
+
+        Returns:
+            The raw SSE stream if raw_buffer is set, otherwise the parsed
+            data payloads joined by newlines
+        """
+        if self.raw_buffer:
+            return self.buffer.get_content()
+        return "\n".join(self._payloads)
+
+    async def collect_json_deltas(
+        self,
+        response: aiohttp.ClientResponse,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Read an Anthropic SSE stream and hand each text delta to on_text.
+
+        Reading, SSE parsing and delta extraction happen in one loop rather
+        than through the process_stream / _read_chunks generator chain.
+        Data that is not JSON is passed to on_text unchanged but is not
+        included in the returned text. A final line or event that the
+        stream does not terminate is still processed.
+
+        Args:
+            response: HTTP response
+            on_text: Optional callback for each piece of text
+
+        Returns:
+            Concatenated text of all content_block_delta events
+        """
+        parts: List[str] = []
+        line_buf = self._line_buf
+        line_buf.clear()
+        self.processing = True
+
+        def handle_line(line: bytes) -> None:
+            data = self._parse_sse_line(line)
+            if not data:
+                return
+            # Both decoders accept the payload as UTF-8 bytes
+            try:
+                event_data = fast_json.loads(data)
+            except ValueError:
+                if on_text:
+                    on_text(data.decode("utf-8", errors="replace"))
+                return
+            if event_data.get("type") == "content_block_delta":
+                text = event_data.get("delta", {}).get("text", "")
+                if text:
+                    parts.append(text)
+                    if on_text:
+                        on_text(text)
+
+        try:
+            async for chunk in response.content.iter_any():
+                if not chunk:
+                    continue
+                self.buffer.add_chunk(chunk)
+                line_buf.extend(chunk)
+
+                start = 0
+                idx = line_buf.find(b"\n")
+                while idx != -1:
+                    handle_line(line_buf[start:idx])
+                    start = idx + 1
+                    idx = line_buf.find(b"\n", start)
+                del line_buf[:start]
+
+            # Flush a trailing line without a newline, then the blank line
+            # that would have dispatched the event it belongs to
+            if line_buf:
+                handle_line(bytes(line_buf))
+            handle_line(b"")
+        finally:
+            line_buf.clear()
+            self.current_event = {}
+            self.processing = False
+
+        return "".join(parts)
 
-    def _parse_sse_line(self, line: str) -> Optional[str]:
+    def _parse_sse_line(self, line: bytes) -> Optional[bytes]:
         """
         Parse a single SSE line.
 
+        The line is handled as raw bytes: SSE framing is ASCII, so only the
+        event and id values are decoded here, and data is left for the
+        caller to decode (or hand straight to a JSON decoder).
+
         Args:
-            line: SSE line to parse
+            line: SSE line to parse, without its line terminator
 
         Returns:
-            Event data if complete event is parsed
+            Raw event data if complete event is parsed
         """
         line = line.strip()
 
         if not line:
             # Empty line indicates end of event
             if self.current_event:
-                event_data = self.current_event.get("data", "")
+                event_data = self.current_event.get("data", b"")
                 self.current_event = {}
                 return event_data
             return None
 
-        if line.startswith(":"):
+        if line.startswith(b":"):
             # Comment line, ignore
             return None
 
-        if ":" in line:
-            field, value = line.split(":", 1)
+        if b":" in line:
+            field, value = line.split(b":", 1)
             field = field.strip()
             value = value.strip()
 
-            if field == "data":
+            if field == b"data":
                 if "data" in self.current_event:
-                    self.current_event["data"] += "\n" + value
+                    self.current_event["data"] += b"\n" + value
                 else:
-                    self.current_event["data"] = value
-            elif field == "event":
-                self.current_event["event"] = value
-            elif field == "id":
-                self.current_event["id"] = value
-            elif field == "retry":
+                    self.current_event["data"] = bytes(value)
+            elif field == b"event":
+                self.current_event["event"] = value.decode("utf-8", errors="replace")
+            elif field == b"id":
+                self.current_event["id"] = value.decode("utf-8", errors="replace")
+            elif field == b"retry":
                 self.current_event["retry"] = int(value)
 
         return None
@@ -347,28 +505,33 @@ class StreamingResponseHandler:
             Complete response content
         """
         complete_content = ""
+        display_callback = self.display_callback
 
         async for event in self.processor.process_stream(response):
-            if event.event_type == StreamEventType.START:
+            event_type = event.event_type
+
+            # CHUNK is by far the most frequent event, so it is tested first
+            if event_type is _CHUNK:
+                if display_callback:
+                    display_callback(event.data)
+
+            elif event_type is _START:
                 logger.info("Stream started")
                 if self.progress_callback:
                     self.progress_callback(
                         {"status": "started", "metadata": event.metadata}
                     )
 
-            elif event.event_type == StreamEventType.CHUNK:
-                complete_content += event.data
-                if self.display_callback:
-                    self.display_callback(event.data)
-
-            elif event.event_type == StreamEventType.END:
+            elif event_type is _END:
+                # The processor's buffer already holds the whole stream
+                complete_content = event.data
                 logger.info("Stream completed")
                 if self.progress_callback:
                     self.progress_callback(
                         {"status": "completed", "stats": event.metadata}
                     )
 
-            elif event.event_type == StreamEventType.ERROR:
+            elif event_type is _ERROR:
                 logger.error(f"Stream error: {event.data}")
                 if self.progress_callback:
                     self.progress_callback({"status": "error", "error": event.data})
@@ -392,6 +555,7 @@ class AnthropicStreamHandler(StreamingResponseHandler):
     def __init__(self, **kwargs):
         """Initialize Anthropic stream handler."""
         super().__init__(**kwargs)
+        # Only the extracted deltas are returned, so the raw SSE is not kept
         self.processor = SSEProcessor()
 
     async def handle_stream(self, response: aiohttp.ClientResponse) -> str:
@@ -404,39 +568,21 @@ class AnthropicStreamHandler(StreamingResponseHandler):
         Returns:
             Complete response content
         """
-        complete_content = ""
+        logger.info("Anthropic stream started")
+        if self.progress_callback:
+            self.progress_callback({"status": "started"})
 
-        async for event in self.processor.process_stream(response):
-            if event.event_type == StreamEventType.START:
-                logger.info("Anthropic stream started")
-                if self.progress_callback:
-                    self.progress_callback({"status": "started"})
-
-            elif event.event_type == StreamEventType.CHUNK:
-                # Parse Anthropic-specific event format
-                try:
-                    event_data = json.loads(event.data)
-                    if event_data.get("type") == "content_block_delta":
-                        delta = event_data.get("delta", {})
-                        text = delta.get("text", "")
-                        if text:
-                            complete_content += text
-                            if self.display_callback:
-                                self.display_callback(text)
-
-                except json.JSONDecodeError:
-                    # Handle non-JSON chunks
-                    if self.display_callback:
-                        self.display_callback(event.data)
-
-            elif event.event_type == StreamEventType.END:
-                logger.info("Anthropic stream completed")
-                if self.progress_callback:
-                    self.progress_callback({"status": "completed"})
+        try:
+            complete_content = await self.processor.collect_json_deltas(
+                response, self.display_callback
+            )
+        except Exception as e:
+            logger.error(f"Anthropic stream error: {e}")
+            raise APIError(f"Anthropic stream error: {e}") from e
 
-            elif event.event_type == StreamEventType.ERROR:
-                logger.error(f"Anthropic stream error: {event.data}")
-                raise APIError(f"Anthropic stream error: {event.data}")
+        logger.info("Anthropic stream completed")
+        if self.progress_callback:
+            self.progress_callback({"status": "completed"})
 
         return complete_content
 
@@ -13,6 +13,25 @@ from typing import List, Optional, Tuple, Union
 from .config import get_config
 from .exceptions import FileError, ValidationError
 
+# Basic command injection patterns, combined so one search covers them all
+_DANGEROUS_COMMAND_RE = re.compile(
+    "|".join(
+        [
+            r";\s*rm\s",
+            r";\s*del\s",
+            r";\s*format\s",
+            r"\|\s*rm\s",
+            r"&&\s*rm\s",
+            r"`[^`]*`",
+            r"\$\([^)]*\)",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Characters that never appear in a real API key
+_API_KEY_INVALID_CHARS_RE = re.compile(r'[<>"\']')
+
 
 def validate_input_length(text: str, max_length: Optional[int] = None) -> str:
     """
@@ -268,7 +287,7 @@ def validate_api_key(api_key: str) -> str:
         raise ValidationError("API key too short")
 
     # Check for suspicious characters
-    if re.search(r'[<>"\']', api_key):
+    if _API_KEY_INVALID_CHARS_RE.search(api_key):
         raise ValidationError("API key contains invalid characters")
 
     return api_key
@@ -294,19 +313,8 @@ def validate_command_input(command: str) -> str:
         raise ValidationError("Command cannot be empty")
 
     # Check for basic command injection patterns
-    dangerous_patterns = [
-        r";\s*rm\s",
-        r";\s*del\s",
-        r";\s*format\s",
-        r"\|\s*rm\s",
-        r"&&\s*rm\s",
-        r"`[^`]*`",
-        r"\$\([^)]*\)",
-    ]
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            raise ValidationError("Command contains potentially dangerous patterns")
+    if _DANGEROUS_COMMAND_RE.search(command):
+        raise ValidationError("Command contains potentially dangerous patterns")
 
     return command
 
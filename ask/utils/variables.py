@@ -12,20 +12,38 @@ This module provides a comprehensive variable management system that allows user
 @date 2024
 """
 
+import atexit
 import json
+import os
 import re
+import threading
+import weakref
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Pattern, Tuple, Union
+
+from . import fast_json
+
+## Seconds to wait for further changes before writing the variable file
+_SAVE_DELAY = 0.1
+
+## Managers holding changes that have not been written yet
+_pending_managers: "weakref.WeakSet[VariableManager]" = weakref.WeakSet()
+
+## Matches a variable assignment such as ``name = value``
+_ASSIGNMENT_RE = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.*)$")
+
+## Matches a name that can be referenced from interpolated text
+_IDENT_RE = re.compile(r"[A-Za-z_]\w*")
 
 
 class VariableManager:
     """!
     @brief Manages persistent user-defined variables across sessions.
-    
+
     The VariableManager class provides a complete solution for variable storage,
     retrieval, and interpolation. Variables are persisted to disk in JSON format
     and automatically loaded on initialization.
-    
+
     @details
     Features:
     - Persistent storage in ~/.config/claude/variables.json
@@ -33,7 +51,7 @@ class VariableManager:
     - Automatic variable interpolation in text
     - Thread-safe operations
     - Graceful error handling
-    
+
     Usage Example:
     @code{.py}
     vm = VariableManager()
@@ -47,10 +65,10 @@ class VariableManager:
     def __init__(self, storage_path: Optional[Union[str, Path]] = None):
         """!
         @brief Initialize variable manager with optional custom storage path.
-        
+
         @param storage_path Optional custom path for variable storage.
                            If None, defaults to ~/.config/claude/variables.json
-        
+
         @details
         The constructor performs the following operations:
         1. Sets up the storage path (custom or default)
@@ -66,87 +84,184 @@ class VariableManager:
             self.storage_path = config_dir / "variables.json"
 
         self._variables: Dict[str, Any] = {}
+        ## str() of each value, kept in step with _variables for interpolation
+        self._strings: Dict[str, str] = {}
+        ## Alternation over the current variable names, rebuilt lazily after changes
+        self._alt_re: Optional[Pattern] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        ## (st_mtime_ns, st_size) of the storage file as last loaded or saved
+        self._stamp: Optional[Tuple[int, int]] = None
         self._load_variables()
 
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """!
+        @brief Return the storage file's modification time and size.
+
+        @return (st_mtime_ns, st_size) of the storage file, or None if it cannot be read
+
+        @details
+        The size is included because coarse filesystem timestamps can leave
+        two quick writes with the same modification time.
+        """
+        try:
+            st = self.storage_path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        """!
+        @brief Reload the variables if another process changed the storage file.
+
+        @details
+        Compares the file's modification time and size against those recorded
+        at the last load or save, so unchanged files are never re-read.
+        Local changes that have not been written yet take precedence.
+        """
+        with self._lock:
+            if self._dirty:
+                return
+            if self._file_stamp() != self._stamp:
+                self._load_variables()
+
     def _load_variables(self):
         """!
         @brief Load variables from storage file.
-        
+
         @details
         Attempts to load variables from the JSON storage file.
         If the file doesn't exist or contains invalid JSON,
         initializes with an empty dictionary.
-        
+
         @note This is a private method and should not be called directly.
         """
-        if self.storage_path.exists():
+        ## Another manager may still be holding changes to the same file
+        for manager in list(_pending_managers):
+            if manager is not self and manager.storage_path == self.storage_path:
+                manager.flush()
+
+        self._stamp = self._file_stamp()
+        self._variables = {}
+        if self._stamp is not None:
             try:
-                with open(self.storage_path) as f:
+                with open(self.storage_path, encoding="utf-8") as f:
                     self._variables = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 self._variables = {}
+        self._strings = {name: str(value) for name, value in self._variables.items()}
+        self._alt_re = None
 
     def _save_variables(self):
         """!
         @brief Save variables to storage file.
-        
+
         @details
         Persists the current variable dictionary to disk in JSON format.
+        The data is written to a temporary file which then replaces the
+        storage file, so a crash never leaves a half-written file behind.
         Creates parent directories if necessary. Silently handles
         permission errors to avoid disrupting program flow.
-        
-        @note This is a private method called automatically after modifications.
+
+        Scheduled saves run on the save timer's thread, so set_variable()
+        never waits on serialization or disk I/O.
+
+        @note This is a private method; use flush() to force a pending write.
         """
+        tmp_path = self.storage_path.with_suffix(".tmp")
         try:
+            ## The timer thread runs this while callers may still be assigning,
+            ## so serialize a snapshot rather than the live dictionary
+            data = fast_json.dumps(dict(self._variables), indent=True)
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.storage_path, "w") as f:
-                json.dump(self._variables, f, indent=2)
-        except (PermissionError, OSError):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.storage_path)
+            self._stamp = self._file_stamp()
+        except (PermissionError, OSError, TypeError, ValueError):
             pass
 
+    def _schedule_save(self):
+        """!
+        @brief Mark the variables as changed and arrange for them to be saved.
+
+        @details
+        Changes made within _SAVE_DELAY seconds of each other are written
+        together by a single timer, instead of rewriting the file on every
+        assignment.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(_SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+        _pending_managers.add(self)
+
+    def flush(self):
+        """!
+        @brief Write any pending changes to the storage file immediately.
+
+        @details
+        Called automatically shortly after a change and at interpreter exit;
+        call it directly when the file must be up to date right away.
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._dirty = False
+                self._save_variables()
+        _pending_managers.discard(self)
+
     def set_variable(self, name: str, value: Any):
         """!
         @brief Set or update a variable value.
-        
+
         @param name Variable name (must be valid identifier)
         @param value Variable value (must be JSON-serializable)
-        
+
         @details
-        Sets a variable and immediately persists to disk.
+        Sets a variable and schedules it to be persisted to disk.
         Overwrites existing variables with the same name.
-        
+
         @code{.py}
         vm.set_variable("user", "Alice")
         vm.set_variable("config", {"theme": "dark", "lang": "en"})
         @endcode
         """
         self._variables[name] = value
-        self._save_variables()
+        self._strings[name] = str(value)
+        self._alt_re = None
+        self._schedule_save()
 
     def get_variable(self, name: str) -> Any:
         """!
         @brief Retrieve a variable value by name.
-        
+
         @param name Variable name to retrieve
         @return Variable value if exists, None otherwise
-        
+
         @code{.py}
         user = vm.get_variable("user")  # Returns "Alice"
         missing = vm.get_variable("nonexistent")  # Returns None
         @endcode
         """
+        self._refresh()
         return self._variables.get(name)
 
     def delete_variable(self, name: str) -> bool:
         """!
         @brief Delete a variable from storage.
-        
+
         @param name Variable name to delete
         @return True if variable existed and was deleted, False otherwise
-        
+
         @details
         Removes the variable from memory and persistent storage.
-        
+
         @code{.py}
         if vm.delete_variable("temp"):
             print("Variable deleted")
@@ -154,64 +269,80 @@ class VariableManager:
         """
         if name in self._variables:
             del self._variables[name]
-            self._save_variables()
+            del self._strings[name]
+            self._alt_re = None
+            self._schedule_save()
             return True
         return False
 
     def list_variables(self) -> Dict[str, Any]:
         """!
         @brief Get a copy of all stored variables.
-        
+
         @return Dictionary containing all variable names and values
-        
+
         @note Returns a copy to prevent external modification
-        
+
         @code{.py}
         all_vars = vm.list_variables()
         for name, value in all_vars.items():
             print(f"{name} = {value}")
         @endcode
         """
+        self._refresh()
         return self._variables.copy()
 
     def clear_variables(self):
         """!
         @brief Remove all variables from storage.
-        
+
         @warning This operation cannot be undone!
-        
+
         @details
         Clears all variables from memory and deletes them from
         persistent storage.
         """
         self._variables = {}
-        self._save_variables()
+        self._strings = {}
+        self._alt_re = None
+        self._schedule_save()
 
     def parse_assignment(self, text: str) -> Optional[tuple]:
         """!
         @brief Parse variable assignment from text input.
-        
+
         @param text Input text to parse for assignment
         @return Tuple of (variable_name, value) if assignment found, None otherwise
-        
+
         @details
         Recognizes assignment patterns:
         - name=value
         - name = value
         - name={"complex": "json"}
-        
+
         Automatically parses JSON values when possible,
         otherwise treats as string.
-        
+
         @code{.py}
         result = vm.parse_assignment("count=42")
         # Returns: ("count", 42)
-        
+
         result = vm.parse_assignment("data=[1,2,3]")
         # Returns: ("data", [1, 2, 3])
         @endcode
         """
-        match = re.match(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.*)$", text.strip())
+        if "=" not in text:
+            return None
+
+        # Cheap checks that reject most chat input before the regex runs
+        text = text.strip()
+        if not text or not (text[0].isalpha() or text[0] == "_"):
+            return None
+        name = text[: text.find("=")].rstrip()
+        if not name.replace("_", "a").isalnum():
+            return None
+
+        match = _ASSIGNMENT_RE.match(text)
         if match:
             var_name, var_value = match.groups()
 
@@ -223,18 +354,38 @@ class VariableManager:
 
         return None
 
+    def _get_alternation(self) -> Optional[Pattern]:
+        """!
+        @brief Build (or reuse) a regex matching any referenceable variable name.
+
+        @return Compiled alternation, or None if no variable can be referenced
+
+        @details
+        Longer names come first so the alternation never stops at a prefix.
+        The pattern is cached until the next change to the variable set.
+        """
+        if self._alt_re is None:
+            names = [name for name in self._strings if _IDENT_RE.fullmatch(name)]
+            if not names:
+                return None
+            names.sort(key=len, reverse=True)
+            self._alt_re = re.compile(
+                r"\b(?:" + "|".join(map(re.escape, names)) + r")\b"
+            )
+        return self._alt_re
+
     def interpolate_variables(self, text: str) -> str:
         """!
         @brief Replace variable references in text with their values.
-        
+
         @param text Input text containing variable references
         @return Text with variables replaced by their values
-        
+
         @details
         Identifies variable references by word boundaries and replaces
         them with their stored values. Non-existent variables are
         left unchanged.
-        
+
         @code{.py}
         vm.set_variable("name", "Bob")
         vm.set_variable("day", "Monday")
@@ -242,37 +393,33 @@ class VariableManager:
         # Returns: "Hello Bob, happy Monday!"
         @endcode
         """
-        words = re.findall(r"\b\w+\b|\W+", text)
-        result = []
+        self._refresh()
+        if not self._strings:
+            return text
 
-        for word in words:
-            if re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", word):
-                if word in self._variables:
-                    value = self._variables[word]
-                    result.append(str(value))
-                else:
-                    result.append(word)
-            else:
-                result.append(word)
+        pattern = self._get_alternation()
+        if pattern is None:
+            return text
 
-        return "".join(result)
+        strings = self._strings
+        return pattern.sub(lambda match: strings[match.group(0)], text)
 
     def process_input(self, text: str) -> tuple[str, bool]:
         """!
         @brief Process input for both assignment and interpolation.
-        
+
         @param text Input text to process
         @return Tuple of (processed_text, was_assignment)
-        
+
         @details
         This is the main entry point for processing user input.
         It first checks for variable assignment, and if none found,
         performs variable interpolation.
-        
+
         @code{.py}
         result, is_assignment = vm.process_input("name=Alice")
         # Returns: ("Variable 'name' set to: Alice", True)
-        
+
         result, is_assignment = vm.process_input("Hello name!")
         # Returns: ("Hello Alice!", False)
         @endcode
@@ -287,66 +434,80 @@ class VariableManager:
         return interpolated, False
 
 
-## Global variable manager instance
-_variable_manager = VariableManager()
+def _flush_pending_managers():
+    """!
+    @brief Write out changes still waiting on a save timer at exit.
+    """
+    for manager in list(_pending_managers):
+        manager.flush()
+
+
+atexit.register(_flush_pending_managers)
+
+## Global variable manager instance, created on first use
+_variable_manager: Optional[VariableManager] = None
 
 
 def get_variable_manager() -> VariableManager:
     """!
     @brief Get the global variable manager instance.
-    
+
     @return The singleton VariableManager instance
-    
+
     @details
     Provides access to the global variable manager for
-    use across the application.
+    use across the application. The instance is created on first
+    call, so importing this module does not touch the disk.
     """
+    global _variable_manager
+    if _variable_manager is None:
+        _variable_manager = VariableManager()
     return _variable_manager
 
 
 def set_variable(name: str, value: Any):
     """!
     @brief Convenience function to set a variable using the global manager.
-    
+
     @param name Variable name
     @param value Variable value
-    
+
     @see VariableManager::set_variable
     """
-    _variable_manager.set_variable(name, value)
+    get_variable_manager().set_variable(name, value)
 
 
 def get_variable(name: str) -> Any:
     """!
     @brief Convenience function to get a variable using the global manager.
-    
+
     @param name Variable name
     @return Variable value or None
-    
+
     @see VariableManager::get_variable
     """
-    return _variable_manager.get_variable(name)
+    return get_variable_manager().get_variable(name)
 
 
 def interpolate_variables(text: str) -> str:
     """!
     @brief Convenience function for variable interpolation using the global manager.
-    
+
     @param text Text containing variable references
     @return Text with variables replaced
-    
+
     @see VariableManager::interpolate_variables
     """
-    return _variable_manager.interpolate_variables(text)
+    return get_variable_manager().interpolate_variables(text)
 
 
 def process_input(text: str) -> tuple[str, bool]:
     """!
     @brief Convenience function to process input using the global manager.
-    
+
     @param text Input text to process
     @return Tuple of (processed_text, was_assignment)
-    
+
     @see VariableManager::process_input
     """
-    return _variable_manager.process_input(text)
\ No newline at end of file
+    return get_variable_manager().process_input(text)